@@ -0,0 +1,35 @@
+"""
+ASGI middleware shared by the Email QA applications.
+Both main.py and simple_mode_switcher.py serve the same routes, so they register the same middleware.
+"""
+
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+
+# Same-origin asset mounts; their requests skip the CORS header handling
+CORS_EXEMPT_PREFIXES = ("/static/", "/attached_assets/")
+
+class StaticExemptCORSMiddleware(CORSMiddleware):
+    """CORSMiddleware that passes requests for the static mounts straight through to the app."""
+    
+    def __init__(self, app, exempt_prefixes=CORS_EXEMPT_PREFIXES, **kwargs):
+        super().__init__(app, **kwargs)
+        self.exempt_prefixes = tuple(exempt_prefixes)
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith(self.exempt_prefixes):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+# Streaming endpoints whose lines must reach the client as they are produced, so they are never gzipped
+GZIP_EXEMPT_PATHS = frozenset(("/api/check-product-tables/stream",))
+
+class StreamExemptGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that leaves incremental streaming responses uncompressed."""
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in GZIP_EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
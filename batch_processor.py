@@ -4,14 +4,17 @@ Handles validation of multiple email templates across different locales.
 """
 
 import asyncio
+import concurrent.futures
+import functools
 import tempfile
 import shutil
 import json
 import logging
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Union
 from fastapi import UploadFile
 from pathlib import Path
 import os
+import uuid
 from datetime import datetime
 
 from email_qa_enhanced import validate_email
@@ -19,9 +22,59 @@ from locale_config import generate_locale_requirements, validate_locale_selectio
 
 logger = logging.getLogger(__name__)
 
+def _default_temp_root() -> Optional[str]:
+    """Directory for per-request temp files: EMAIL_QA_TEMP_DIR, else the /dev/shm tmpfs when writable."""
+    configured = os.environ.get('EMAIL_QA_TEMP_DIR')
+    if configured:
+        return configured
+    if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK):
+        return '/dev/shm'
+    return None
+
+# Uploaded templates and generated requirements are short-lived, so they are written to RAM
+# when possible; None falls back to the system temp directory
+TEMP_ROOT = _default_temp_root()
+
+# Finished batches kept for result polling, beyond which the oldest are dropped regardless of age
+_MAX_RETAINED_BATCHES = int(os.environ.get('MAX_RETAINED_BATCHES', 100))
+
+def _new_batch_id(prefix: str) -> str:
+    """Readable, time-ordered batch ID; the random suffix keeps batches started in the same second apart."""
+    return f"{prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex}"
+
+# validate_email is synchronous (HTML parsing, link and image checks), so locales are validated
+# in a bounded worker pool instead of blocking the event loop one after another
+_VALIDATION_WORKERS = int(os.environ.get('BATCH_VALIDATION_WORKERS', min(8, (os.cpu_count() or 1) + 4)))
+_VALIDATION_POOL = concurrent.futures.ThreadPoolExecutor(
+    max_workers=_VALIDATION_WORKERS, thread_name_prefix="batch-validate"
+)
+
+async def _run_in_pool(func, *args, **kwargs):
+    """Run a blocking call in the batch validation pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_VALIDATION_POOL, functools.partial(func, *args, **kwargs))
+
+def _extract_template_metadata(email_path: str) -> dict:
+    """Parse a template file and return its sender/subject/preheader metadata."""
+    from email_qa_enhanced import parse_email_html, extract_email_metadata
+    return extract_email_metadata(parse_email_html(email_path))
+
+async def _read_template(template: Union[UploadFile, bytes]) -> bytes:
+    """Return template content, accepting either pre-buffered bytes or an UploadFile."""
+    if isinstance(template, bytes):
+        return template
+    # Reset file pointer to beginning
+    await template.seek(0)
+    return await template.read()
+
 class BatchValidationRequest:
     """Request model for batch validation."""
     
+    __slots__ = (
+        "templates", "base_requirements", "selected_locales",
+        "check_product_tables", "product_table_timeout", "batch_id"
+    )
+    
     def __init__(
         self,
         templates: Dict[str, UploadFile],
@@ -35,14 +88,19 @@ class BatchValidationRequest:
         self.selected_locales = selected_locales
         self.check_product_tables = check_product_tables
         self.product_table_timeout = product_table_timeout
-        self.batch_id = f"batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        self.batch_id = _new_batch_id("batch")
 
 class EnhancedBatchValidationRequest:
     """Enhanced request model for batch validation with automatic locale detection."""
     
+    __slots__ = (
+        "templates", "base_requirements", "custom_requirements", "selected_locales",
+        "check_product_tables", "product_table_timeout", "batch_id"
+    )
+    
     def __init__(
         self,
-        templates: Dict[str, UploadFile],
+        templates: Dict[str, Union[UploadFile, bytes]],
         base_requirements: dict,
         custom_requirements: Dict[str, dict],
         selected_locales: List[str],
@@ -55,7 +113,7 @@ class EnhancedBatchValidationRequest:
         self.selected_locales = selected_locales
         self.check_product_tables = check_product_tables
         self.product_table_timeout = product_table_timeout
-        self.batch_id = f"enhanced_batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        self.batch_id = _new_batch_id("enhanced_batch")
 
 class BatchValidationResult:
     """Result model for batch validation."""
@@ -196,17 +254,12 @@ class BatchProcessor:
             template_file = request.templates[locale]
             
             # Create temporary email file first
-            with tempfile.NamedTemporaryFile(mode='wb', suffix='.html', delete=False) as temp_email:
-                # Reset file pointer to beginning
-                await template_file.seek(0)
-                content = await template_file.read()
-                temp_email.write(content)
+            with tempfile.NamedTemporaryFile(mode='wb', suffix='.html', delete=False, dir=TEMP_ROOT) as temp_email:
+                temp_email.write(await _read_template(template_file))
                 temp_email_path = temp_email.name
             
             # Extract metadata from the actual template to use as Expected values
-            from email_qa_enhanced import parse_email_html, extract_email_metadata
-            soup = parse_email_html(temp_email_path)
-            actual_metadata = extract_email_metadata(soup)
+            actual_metadata = await _run_in_pool(_extract_template_metadata, temp_email_path)
             
             # Generate locale-specific requirements using actual template metadata as Expected values
             locale_requirements = generate_locale_requirements(
@@ -221,13 +274,14 @@ class BatchProcessor:
             
             # Do NOT override sender_address and reply_address - these should be validated against requirements
             
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as temp_req:
+            with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False, dir=TEMP_ROOT) as temp_req:
                 json.dump(locale_requirements, temp_req, indent=2)
                 temp_req_path = temp_req.name
             
             try:
                 # Run validation for this locale
-                validation_result = validate_email(
+                validation_result = await _run_in_pool(
+                    validate_email,
                     email_path=temp_email_path,
                     requirements_path=temp_req_path,
                     check_product_tables=request.check_product_tables,
@@ -284,19 +338,30 @@ class BatchProcessor:
         """Get complete results for a finished batch."""
         return self.active_batches.get(batch_id)
     
-    def cleanup_old_batches(self, max_age_hours: int = 24):
-        """Clean up old batch results to prevent memory leaks."""
+    def cleanup_old_batches(self, max_age_hours: int = 24, max_batches: int = _MAX_RETAINED_BATCHES):
+        """
+        Clean up old batch results to prevent memory leaks.
+        Finished batches older than max_age_hours are removed, and beyond max_batches finished
+        batches the oldest are removed too. Running batches are never removed.
+        """
         current_time = datetime.now()
-        to_remove = []
+        finished = sorted(
+            (result.end_time, batch_id)
+            for batch_id, result in self.active_batches.items()
+            if result.end_time
+        )
         
-        for batch_id, result in self.active_batches.items():
-            if result.end_time:
-                age = current_time - result.end_time
-                if age.total_seconds() > (max_age_hours * 3600):
-                    to_remove.append(batch_id)
+        to_remove = [
+            batch_id for end_time, batch_id in finished
+            if (current_time - end_time).total_seconds() > (max_age_hours * 3600)
+        ]
+        excess = len(finished) - len(to_remove) - max_batches
+        if excess > 0:
+            to_remove.extend(batch_id for _, batch_id in finished[len(to_remove):len(to_remove) + excess])
         
         for batch_id in to_remove:
             del self.active_batches[batch_id]
+            self.cancelled_batches.discard(batch_id)
             logger.info(f"Cleaned up old batch {batch_id}")
     
     async def process_enhanced_batch(self, request: 'EnhancedBatchValidationRequest') -> BatchValidationResult:
@@ -381,10 +446,8 @@ class BatchProcessor:
             template_file = request.templates[locale]
             
             # Create temporary email file
-            with tempfile.NamedTemporaryFile(mode='wb', suffix='.html', delete=False) as temp_email:
-                await template_file.seek(0)
-                content = await template_file.read()
-                temp_email.write(content)
+            with tempfile.NamedTemporaryFile(mode='wb', suffix='.html', delete=False, dir=TEMP_ROOT) as temp_email:
+                temp_email.write(await _read_template(template_file))
                 temp_email_path = temp_email.name
             
             # Use custom requirements if provided for this locale, otherwise generate from base
@@ -398,13 +461,14 @@ class BatchProcessor:
                 )
                 logger.info(f"Generated requirements from base for locale {locale}")
             
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as temp_req:
+            with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False, dir=TEMP_ROOT) as temp_req:
                 json.dump(locale_requirements, temp_req, indent=2)
                 temp_req_path = temp_req.name
             
             try:
                 # Run validation for this locale
-                validation_result = validate_email(
+                validation_result = await _run_in_pool(
+                    validate_email,
                     email_path=temp_email_path,
                     requirements_path=temp_req_path,
                     check_product_tables=request.check_product_tables,
@@ -10,6 +10,8 @@ import json
 import time
 from urllib.parse import urlparse, quote
 import requests
+from http.cookiejar import DefaultCookiePolicy
+from requests.adapters import HTTPAdapter
 from typing import Dict, Any, Optional, List
 
 # Global variable to store the last raw response for debugging
@@ -30,6 +32,13 @@ last_scrapingbee_raw_response = {
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Shared keep-alive session for the cloud browser APIs. Every call goes to the same API host,
+# so parallel checks draw from one connection pool instead of opening a new TLS connection each.
+# No cookies are stored, since the session is shared across threads and requests.
+_api_session = requests.Session()
+_api_session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+_api_session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
 # Helper function to load secrets from Replit
 def _load_secrets_from_replit():
     """Load API keys from Replit secrets files."""
@@ -363,7 +372,7 @@ def check_with_scrapingbee(url: str, timeout: int) -> Dict[str, Any]:
         # Try the main API URL first
         try:
             logger.info(f"Trying primary request method with JavaScript rendering")
-            response = requests.get(api_url, timeout=request_timeout)
+            response = _api_session.get(api_url, timeout=request_timeout)
             duration = time.time() - start_time
             js_execution_success = True
             
@@ -382,7 +391,7 @@ def check_with_scrapingbee(url: str, timeout: int) -> Dict[str, Any]:
             remaining_time = max(timeout - (time.time() - start_time), 5)
             backup_request_timeout = min(remaining_time + 5, 20)  # Keep backup timeout shorter
             
-            response = requests.get(backup_api_url, timeout=backup_request_timeout)
+            response = _api_session.get(backup_api_url, timeout=backup_request_timeout)
             duration = time.time() - start_time
             js_execution_success = False
             
@@ -981,7 +990,7 @@ def check_with_browserless(url: str, timeout: int) -> Dict[str, Any]:
         logger.info(f"Making Browserless API request to {url} (timeout: {timeout}s)")
         
         # Make the request with detailed logging
-        response = requests.post(api_url, json=payload, timeout=timeout)
+        response = _api_session.post(api_url, json=payload, timeout=timeout)
         duration = time.time() - start_time
         
         logger.info(f"Browserless response received in {duration:.2f}s with status code {response.status_code}")
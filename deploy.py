@@ -7,6 +7,7 @@ Optimized for Cloud Run with proper port configuration and error handling.
 import os
 import sys
 import logging
+import importlib.util
 import uvicorn
 
 # Set up logging
@@ -52,7 +53,10 @@ def main():
             "port": port,
             "log_level": "info",
             "access_log": True,
-            "lifespan": "on"
+            "lifespan": "on",
+            # Prefer the uvloop event loop and httptools parser; uvloop is not available on Windows
+            "loop": "uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+            "http": "httptools" if importlib.util.find_spec("httptools") else "h11"
         }
         
         logger.info("Starting uvicorn server with production configuration...")
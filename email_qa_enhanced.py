@@ -10,6 +10,7 @@ import time
 import logging
 import requests
 import threading
+import contextvars
 import queue
 from datetime import datetime
 from bs4 import BeautifulSoup
@@ -548,10 +549,23 @@ def validate_utm_parameters(url, expected_utm):
     
     return utm_issues
 
+# One keep-alive session per worker thread for link status checks; email links often share a host
+_status_sessions = threading.local()
+
+def _status_session():
+    """Return this thread's pooled session for status checks, with cookies from earlier checks cleared."""
+    session = getattr(_status_sessions, 'session', None)
+    if session is None:
+        session = _status_sessions.session = requests.Session()
+    else:
+        session.cookies.clear()
+    return session
+
 def check_http_status(url, timeout=None):
     """
     Check HTTP status code of a URL with configurable timeout.
     Uses more robust checking with retries for production mode.
+    Only reachability is checked - HEAD is used first and response bodies are never downloaded.
     
     Args:
         url: The URL to check
@@ -566,11 +580,19 @@ def check_http_status(url, timeout=None):
     # Determine number of retries based on mode
     max_retries = config.max_retries * 2 if config.is_production else config.max_retries
     retry_delay = 1  # seconds between retries
+    session = _status_session()
     
     for attempt in range(max_retries + 1):
         try:
             # First try HEAD request (faster)
-            response = requests.head(url, timeout=timeout, allow_redirects=True)
+            response = session.head(url, timeout=timeout, allow_redirects=True)
+
+            # Some servers reject HEAD outright - only then pay for a GET
+            if response.status_code == 405:
+                logger.info(f"HEAD not allowed for {url}, retrying with GET")
+                response = session.get(url, timeout=timeout, allow_redirects=True,
+                                        stream=True)  # stream=True to avoid downloading full content
+                response.close()
             return response.status_code
         except (requests.exceptions.Timeout, 
                 requests.exceptions.ConnectionError, 
@@ -586,7 +608,7 @@ def check_http_status(url, timeout=None):
             if attempt == max_retries:
                 try:
                     logger.info(f"Trying GET request as fallback for {url}")
-                    response = requests.get(url, timeout=timeout, allow_redirects=True, 
+                    response = session.get(url, timeout=timeout, allow_redirects=True, 
                                            stream=True)  # stream=True to avoid downloading full content
                     response.close()  # Close to avoid keeping connection open
                     return response.status_code
@@ -604,6 +626,39 @@ def check_http_status(url, timeout=None):
     # This should never happen due to the return in the except block
     return "Connection failed after multiple attempts"
 
+# Bot protection phrases in page content, matched in a single case-insensitive scan
+_BOT_PAGE_PHRASE_RE = re.compile(
+    r'captcha|security check|access denied|suspicious activity|unusual traffic|'
+    r'too many requests|rate limit|please verify',
+    re.I
+)
+# Bot protection indicators in request error messages
+_BOT_ERROR_RE = re.compile(r'captcha|bot|cloudflare|security', re.I)
+
+# Browser-like headers for product page fetches
+_PRODUCT_PAGE_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+    'Cache-Control': 'max-age=0'
+}
+
+# One keep-alive session per worker thread, so repeated checks against a host reuse its connection
+_product_page_sessions = threading.local()
+
+def _product_page_session():
+    """Return this thread's pooled session for product page fetches, with cookies from earlier checks cleared."""
+    session = getattr(_product_page_sessions, 'session', None)
+    if session is None:
+        session = requests.Session()
+        session.headers.update(_PRODUCT_PAGE_HEADERS)
+        _product_page_sessions.session = session
+    else:
+        session.cookies.clear()
+    return session
+
 def check_for_product_tables(url, timeout=None):
     """
     Check if a URL's HTML contains product table classes with improved error handling.
@@ -898,16 +953,8 @@ def check_for_product_tables(url, timeout=None):
     max_retries = config.max_retries * 2 if config.is_production else config.max_retries
     retry_delay = 1  # seconds between retries
     
-    # Create a session with appropriate headers to appear more like a regular browser
-    session = requests.Session()
-    session.headers.update({
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.5',
-        'Connection': 'keep-alive',
-        'Upgrade-Insecure-Requests': '1',
-        'Cache-Control': 'max-age=0'
-    })
+    # Reuse this thread's session with appropriate headers to appear more like a regular browser
+    session = _product_page_session()
     
     # Normal path with retries
     for attempt in range(max_retries + 1):
@@ -920,21 +967,12 @@ def check_for_product_tables(url, timeout=None):
             if response.status_code == 200:
                 page_content = response.text
                 
-                # Check for common bot detection signs
-                bot_detection_phrases = [
-                    'captcha', 'security check', 'access denied', 
-                    'suspicious activity', 'unusual traffic', 
-                    'too many requests', 'rate limit', 'please verify'
-                ]
-                
                 # Check response content for bot detection indications - but be more specific
                 # to avoid false positives on common words like "blocked"
-                has_bot_protection = False
-                for phrase in bot_detection_phrases:
-                    if phrase in page_content.lower():
-                        has_bot_protection = True
-                        logger.warning(f"Bot detection phrase '{phrase}' found on {url}")
-                        break
+                bot_phrase = _BOT_PAGE_PHRASE_RE.search(page_content)
+                has_bot_protection = bot_phrase is not None
+                if has_bot_protection:
+                    logger.warning(f"Bot detection phrase '{bot_phrase.group(0).lower()}' found on {url}")
                         
                 # Only if we have a clear bot protection indicator 
                 if has_bot_protection:
@@ -1087,20 +1125,11 @@ def check_for_product_tables(url, timeout=None):
                         if 'partly-products-showcase.lovable.app' in url:
                             logger.info(f"Skipping bot detection check for partly-products-showcase.lovable.app")
                         else:
-                            response_text = response.text.lower()
-                            # More specific bot detection phrases to avoid false positives
-                            bot_detection_phrases = [
-                                'captcha', 'security check', 'access denied',
-                                'suspicious activity', 'unusual traffic',
-                                'too many requests', 'rate limit', 'please verify'
-                            ]
-                            # Look for clear evidence of bot protection
-                            has_bot_protection = False
-                            for phrase in bot_detection_phrases:
-                                if phrase in response_text:
-                                    has_bot_protection = True
-                                    logger.warning(f"Bot protection phrase '{phrase}' found in response")
-                                    break
+                            # Look for clear evidence of bot protection, using specific phrases to avoid false positives
+                            bot_phrase = _BOT_PAGE_PHRASE_RE.search(response.text)
+                            has_bot_protection = bot_phrase is not None
+                            if has_bot_protection:
+                                logger.warning(f"Bot protection phrase '{bot_phrase.group(0).lower()}' found in response")
                                     
                             if has_bot_protection:
                                 logger.warning(f"Possible bot protection disguised as {response.status_code} status code")
@@ -1161,7 +1190,7 @@ def check_for_product_tables(url, timeout=None):
             logger.error(error_message)
             
             # Check for bot detection indicators in the error message
-            if 'captcha' in str(e).lower() or 'bot' in str(e).lower() or 'cloudflare' in str(e).lower() or 'security' in str(e).lower():
+            if _BOT_ERROR_RE.search(str(e)):
                 logger.warning(f"Generic error contains bot detection indicators: {str(e)}")
                 return {
                     'found': False,
@@ -1316,7 +1345,8 @@ def check_links(links, expected_utm, check_product_tables=False, product_table_t
                         })
                 
                 # Start thread and wait with timeout
-                thread = threading.Thread(target=check_table_thread)
+                # Run in a copy of this context so a per-request mode override still applies
+                thread = threading.Thread(target=contextvars.copy_context().run, args=(check_table_thread,))
                 thread.daemon = True
                 thread.start()
                 
@@ -1394,7 +1424,7 @@ def check_links(links, expected_utm, check_product_tables=False, product_table_t
     
     return results
 
-def validate_email(email_path, requirements_path, check_product_tables=False, product_table_timeout=None):
+def validate_email(email_path, requirements_path, check_product_tables=False, product_table_timeout=None, requirements_dict=None):
     """
     Main function to validate email against requirements.
     Enhanced with mode awareness and improved error handling.
@@ -1404,6 +1434,7 @@ def validate_email(email_path, requirements_path, check_product_tables=False, pr
         requirements_path: Path to the requirements JSON file
         check_product_tables: Whether to check for product tables (default: False)
         product_table_timeout: Timeout for product table checks in seconds (default: use config)
+        requirements_dict: Already-parsed requirements; when given, requirements_path is not read
     """
     metadata = None  # Initialize to avoid unbound variable issue
     
@@ -1411,8 +1442,13 @@ def validate_email(email_path, requirements_path, check_product_tables=False, pr
         # Parse email HTML
         soup = parse_email_html(email_path)
         
-        # Load requirements
-        requirements = load_requirements(requirements_path)
+        # Load requirements, or reuse the caller's parsed copy without mutating it
+        if requirements_dict is not None:
+            requirements = dict(requirements_dict)
+            if isinstance(requirements.get('metadata'), dict):
+                requirements['metadata'] = dict(requirements['metadata'])
+        else:
+            requirements = load_requirements(requirements_path)
         
         # Extract metadata and validate
         metadata = extract_email_metadata(soup)
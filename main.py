@@ -3,9 +3,10 @@ Main entry point for the Email QA Automation application.
 This file is used for deployment on Replit.
 """
 import os
+import asyncio
 import uvicorn
 from fastapi import FastAPI, UploadFile, File, HTTPException, Query, Body
-from fastapi.middleware.cors import CORSMiddleware
+from app_middleware import StaticExemptCORSMiddleware, StreamExemptGZipMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import JSONResponse, HTMLResponse, FileResponse
 from typing import Optional, List
@@ -14,10 +15,18 @@ import tempfile
 import json
 import logging
 
+# Parse uploaded JSON with orjson when it is installed; it reads bytes directly
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 # Import the email_qa module
 from email_qa_enhanced import validate_email
 from cloud_browser_automation import check_for_product_tables_cloud
 from browser_automation import check_for_product_tables_sync
+from batch_processor import TEMP_ROOT
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -26,15 +35,18 @@ logger = logging.getLogger(__name__)
 # Create FastAPI app
 app = FastAPI(title="Email QA Automation API")
 
-# Configure CORS
+# Configure CORS; requests for the static mounts skip it
 app.add_middleware(
-    CORSMiddleware,
+    StaticExemptCORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
+# Compress larger JSON bodies (/run-qa results, batch results) for clients that accept gzip
+app.add_middleware(StreamExemptGZipMiddleware, minimum_size=1024, compresslevel=6)
+
 # Mount static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
@@ -49,12 +61,14 @@ app.include_router(api_router, prefix="/api")
 
 # Import and include enhanced batch validation routes
 try:
-    from simple_mode_switcher import app as simple_mode_app
+    from simple_mode_switcher import app as simple_mode_app, prewarm_browser_drivers
     # Mount the simple_mode_switcher routes to the main app
     for route in simple_mode_app.routes:
         if hasattr(route, 'path') and hasattr(route, 'methods'):
             # Add the route to main app
             app.router.routes.append(route)
+    # Copied routes do not bring simple_mode_switcher's startup handlers with them
+    app.add_event_handler("startup", prewarm_browser_drivers)
     logger.info("Enhanced batch validation routes loaded successfully")
 except Exception as e:
     logger.error(f"Failed to load enhanced batch validation routes: {e}")
@@ -270,6 +284,9 @@ async def serve_asset(file_path: str):
     # For all other files, use FileResponse
     return FileResponse(full_path)
 
+# Uploads are copied to disk in 1 MiB chunks instead of copyfileobj's small default
+_UPLOAD_CHUNK_SIZE = 1024 * 1024
+
 @app.post("/run-qa")
 async def run_qa(
     email: UploadFile = File(...), 
@@ -291,8 +308,9 @@ async def run_qa(
     """
     # IMPORTANT: Force check_product_tables to False to prevent hanging
     check_product_tables = False
-    # Create temporary directory
-    temp_dir = tempfile.mkdtemp()
+    # Create temporary directory (on tmpfs when available); its finalizer also removes it if cleanup is ever skipped
+    temp_dir_obj = tempfile.TemporaryDirectory(dir=TEMP_ROOT, ignore_cleanup_errors=True)
+    temp_dir = temp_dir_obj.name
     
     try:
         # Save uploaded files
@@ -300,10 +318,10 @@ async def run_qa(
         req_path = os.path.join(temp_dir, "requirements.json")
         
         with open(email_path, "wb") as buffer:
-            shutil.copyfileobj(email.file, buffer)
+            shutil.copyfileobj(email.file, buffer, _UPLOAD_CHUNK_SIZE)
         
         with open(req_path, "wb") as buffer:
-            shutil.copyfileobj(requirements.file, buffer)
+            shutil.copyfileobj(requirements.file, buffer, _UPLOAD_CHUNK_SIZE)
         
         # Load requirements first so we can include them in the results
         with open(req_path, "r") as f:
@@ -316,7 +334,9 @@ async def run_qa(
         # Convert check_product_tables to a boolean to handle the None case
         check_tables = bool(check_product_tables)
         
-        results = validate_email(
+        # validate_email blocks on HTML parsing and link checks, so keep it off the event loop
+        results = await asyncio.to_thread(
+            validate_email,
             email_path, 
             req_path, 
             check_product_tables=check_tables,
@@ -351,7 +371,7 @@ async def run_qa(
     
     finally:
         # Clean up temporary files
-        shutil.rmtree(temp_dir)
+        temp_dir_obj.cleanup()
 
 @app.post("/check-product-tables")
 @app.post("/check_product_tables")  # Add underscore version for frontend compatibility
@@ -379,8 +399,19 @@ async def check_product_tables(
     # Import the simplified cloud detection endpoint handler
     from simplified_cloud_endpoint import check_product_tables_endpoint
     
-    # Use the simplified implementation that directly uses cloud detection
-    return check_product_tables_endpoint(urls, timeout)
+    # Use the simplified implementation that directly uses cloud detection, one worker thread per URL
+    # so a slow page no longer delays the others (bounded to keep cloud API usage in check)
+    semaphore = asyncio.Semaphore(8)
+    
+    async def check_one(url):
+        async with semaphore:
+            response = await asyncio.to_thread(check_product_tables_endpoint, [url], timeout)
+            return response["results"]
+    
+    results = {}
+    for url_results in await asyncio.gather(*[check_one(url) for url in dict.fromkeys(urls)]):
+        results.update(url_results)
+    return {"results": results}
     
     # Set up logging
     logger = logging.getLogger(__name__)
@@ -647,7 +678,7 @@ async def batch_validate(
     Returns:
         dict: Batch processing results with per-locale validation results
     """
-    from batch_processor import BatchProcessor, BatchValidationRequest
+    from batch_processor import BatchValidationRequest, batch_processor
     import json
     
     try:
@@ -657,13 +688,6 @@ async def batch_validate(
         except json.JSONDecodeError:
             raise HTTPException(status_code=400, detail="Invalid locale_mapping JSON format")
         
-        # Parse base requirements
-        base_req_content = await base_requirements.read()
-        try:
-            base_req_dict = json.loads(base_req_content.decode('utf-8'))
-        except json.JSONDecodeError:
-            raise HTTPException(status_code=400, detail="Invalid base requirements JSON format")
-        
         # Map templates to locales
         template_dict = {}
         for template in templates:
@@ -673,7 +697,7 @@ async def batch_validate(
                 if locale in selected_locales:
                     template_dict[locale] = template
         
-        # Validate that all selected locales have templates
+        # Validate that all selected locales have templates before reading the base requirements
         missing_templates = [locale for locale in selected_locales if locale not in template_dict]
         if missing_templates:
             raise HTTPException(
@@ -681,6 +705,13 @@ async def batch_validate(
                 detail=f"Missing templates for locales: {', '.join(missing_templates)}"
             )
         
+        # Parse base requirements
+        base_req_content = await base_requirements.read()
+        try:
+            base_req_dict = _json_loads(base_req_content)
+        except json.JSONDecodeError:
+            raise HTTPException(status_code=400, detail="Invalid base requirements JSON format")
+        
         # Create batch request
         batch_request = BatchValidationRequest(
             templates=template_dict,
@@ -690,9 +721,9 @@ async def batch_validate(
             product_table_timeout=product_table_timeout
         )
         
-        # Process batch
-        processor = BatchProcessor()
-        result = await processor.process_batch(batch_request)
+        # Process batch on the shared processor so progress/cancel/result lookups can see it
+        result = await batch_processor.process_batch(batch_request)
+        batch_processor.cleanup_old_batches()
         
         return {
             "batch_id": result.batch_id,
@@ -1,5 +1,6 @@
 import uvicorn
 import os
+import importlib.util
 import signal
 import sys
 import logging
@@ -60,7 +61,15 @@ def run_server():
     
     # Start the server
     print("Starting FastAPI server on port 5000")
-    uvicorn.run(app, host="0.0.0.0", port=5000, log_level="info")
+    # Prefer the uvloop event loop and httptools parser; uvloop is not available on Windows
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=5000,
+        log_level="info",
+        loop="uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+        http="httptools" if importlib.util.find_spec("httptools") else "h11"
+    )
 
 if __name__ == "__main__":
     run_server()
\ No newline at end of file
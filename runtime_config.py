@@ -6,6 +6,8 @@ Provides mode switching between development and production.
 import os
 import logging
 import json
+import contextlib
+import contextvars
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -50,9 +52,55 @@ def _load_api_keys_from_replit():
 # Try to load secrets at module import time
 _load_api_keys_from_replit()
 
+def _settings_for_mode(mode):
+    """Mode-dependent settings applied by set_mode and mode_override."""
+    if mode == "development":
+        return {
+            "enable_test_redirects": True,
+            "product_table_timeout": 30,  # Longer timeout in development
+            "request_timeout": 10,
+            "max_retries": 2,
+            "test_domains": {"localhost:5001"},
+        }
+    return {
+        "enable_test_redirects": False,  # Never redirect to test in production
+        "product_table_timeout": 20,  # Shorter timeout for production
+        "request_timeout": 8,
+        "max_retries": 3,
+        "test_domains": set(),  # No test domains in production
+    }
+
+# Per-request mode and settings set by RuntimeConfig.mode_override; None means use the global mode.
+# Each asyncio task (and each context copied into a worker thread) sees its own value.
+_mode_override = contextvars.ContextVar('mode_override', default=None)
+
+def _mode_setting(name):
+    """Attribute that reads the current mode_override first, then the value set on the instance."""
+    def get(self):
+        override = _mode_override.get()
+        if override is not None:
+            return override[name]
+        try:
+            return self.__dict__[name]
+        except KeyError:
+            # Keep getattr(config, name, default) and hasattr working for settings not set yet
+            raise AttributeError(name) from None
+    
+    def set(self, value):
+        self.__dict__[name] = value
+    
+    return property(get, set)
+
 class RuntimeConfig:
     """Runtime configuration that can be changed without restarting."""
     
+    mode = _mode_setting("mode")
+    enable_test_redirects = _mode_setting("enable_test_redirects")
+    product_table_timeout = _mode_setting("product_table_timeout")
+    request_timeout = _mode_setting("request_timeout")
+    max_retries = _mode_setting("max_retries")
+    test_domains = _mode_setting("test_domains")
+    
     def __init__(self):
         # Check if this is a deployment environment
         self.is_deployment_env = os.environ.get("REPL_SLUG") is not None and os.environ.get("REPL_OWNER") is not None
@@ -120,19 +168,13 @@ class RuntimeConfig:
     
     def _update_settings_for_mode(self):
         """Update settings based on current mode."""
-        if self.mode == "development":
-            self.enable_test_redirects = True
-            self.product_table_timeout = 30  # Longer timeout in development
-            self.request_timeout = 10
-            self.max_retries = 2
-            self.test_domains = {"localhost:5001"}
+        # The global mode, even while a request has a mode_override active
+        mode = self.__dict__["mode"]
+        for name, value in _settings_for_mode(mode).items():
+            setattr(self, name, value)
+        if mode == "development":
             logger.info("Using DEVELOPMENT configuration")
         else:  # Production mode
-            self.enable_test_redirects = False  # Never redirect to test in production
-            self.product_table_timeout = 20  # Shorter timeout for production
-            self.request_timeout = 8
-            self.max_retries = 3
-            self.test_domains = set()  # No test domains in production
             logger.info("Using PRODUCTION configuration")
     
     def is_development(self):
@@ -218,6 +260,25 @@ class RuntimeConfig:
         logger.info(f"Mode changed: {old_mode} -> {self.mode}")
         return True
     
+    @contextlib.contextmanager
+    def mode_override(self, mode):
+        """
+        Use another mode for the current request only, without changing the global mode.
+        Concurrent requests keep their own mode; blocking work started in a worker thread
+        must be run inside contextvars.copy_context() to see the override.
+        
+        Args:
+            mode: 'development' or 'production'
+        """
+        if mode not in ["development", "production"]:
+            raise ValueError(f"Invalid mode: {mode}, must be 'development' or 'production'")
+        
+        token = _mode_override.set({"mode": mode, **_settings_for_mode(mode)})
+        try:
+            yield self
+        finally:
+            _mode_override.reset(token)
+    
     def create_test_url(self, url):
         """
         Create a test URL for the given production URL.
@@ -3,6 +3,8 @@ Selenium-based browser automation for Email QA System.
 Uses headless browsers with Selenium (Chrome/Firefox) for browser automation to check for product tables.
 """
 import os
+import atexit
+import queue
 import threading
 import time
 from urllib.parse import urlparse
@@ -61,6 +63,52 @@ logger = logging.getLogger(__name__)
 _browser_check_complete = False
 _browser_check_lock = threading.Lock()
 
+# Warm WebDriver instances reused across checks instead of starting a browser per URL
+_DRIVER_POOL_SIZE = int(os.environ.get("SELENIUM_DRIVER_POOL_SIZE", "4"))
+_driver_pool = queue.Queue(maxsize=_DRIVER_POOL_SIZE)
+
+def _quit_driver(driver):
+    """Quit a WebDriver, ignoring errors from browsers that already went away."""
+    try:
+        driver.quit()
+    except:
+        pass
+
+def _acquire_driver():
+    """
+    Take a warm driver from the pool.
+    
+    Returns:
+        tuple: (driver, browser_used) or (None, None) if the pool is empty
+    """
+    try:
+        return _driver_pool.get_nowait()
+    except queue.Empty:
+        return None, None
+
+def _release_driver(driver, browser_used, reusable):
+    """Return a healthy driver to the pool; quit it if it failed or the pool is full."""
+    if reusable:
+        try:
+            driver.delete_all_cookies()
+            _driver_pool.put_nowait((driver, browser_used))
+            return
+        except queue.Full:
+            pass
+        except Exception as e:
+            logger.debug(f"Discarding pooled driver after cleanup error: {e}")
+    _quit_driver(driver)
+
+@atexit.register
+def _shutdown_driver_pool():
+    """Quit all pooled drivers when the process exits."""
+    while True:
+        try:
+            driver, _ = _driver_pool.get_nowait()
+        except queue.Empty:
+            break
+        _quit_driver(driver)
+
 # Add a public function to check if any browsers are available
 def check_browser_availability():
     """
@@ -89,6 +137,10 @@ def _check_browser_availability():
     """Check which browsers are available and set global availability flags."""
     global CHROME_AVAILABLE, FIREFOX_AVAILABLE, _browser_check_complete
     
+    # The probe result never changes once taken, so skip the environment checks and lock
+    if _browser_check_complete:
+        return CHROME_AVAILABLE or FIREFOX_AVAILABLE
+    
     # Check if we're in a Replit environment
     is_replit = os.environ.get('REPL_ID') is not None or os.environ.get('REPLIT_ENVIRONMENT') is not None
     
@@ -227,6 +279,87 @@ def _check_browser_availability():
         # At least one browser is available
         return CHROME_AVAILABLE or FIREFOX_AVAILABLE
 
+def _start_chrome_driver():
+    """Launch a headless Chrome WebDriver for product table checks."""
+    # Configure Chrome options
+    options = ChromeOptions()
+    options.add_argument("--headless=new")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    
+    # Add user agent to reduce detection as bot
+    options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
+    
+    driver_kwargs = {}
+    if CHROME_WDM_AVAILABLE:
+        try:
+            driver_path = ChromeDriverManager().install()
+            if driver_path and isinstance(driver_path, str):
+                service = ChromeService(executable_path=driver_path)
+                driver_kwargs["service"] = service
+        except Exception as e:
+            logger.debug(f"Could not use ChromeDriverManager: {e}")
+    
+    return webdriver.Chrome(options=options, **driver_kwargs)
+
+def _start_firefox_driver():
+    """Launch a headless Firefox WebDriver for product table checks."""
+    # Configure Firefox options
+    options = FirefoxOptions()
+    options.add_argument("--headless")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    
+    # Add user agent to reduce detection as bot
+    options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Firefox/91.0")
+    
+    driver_kwargs = {}
+    if FIREFOX_WDM_AVAILABLE:
+        try:
+            driver_path = GeckoDriverManager().install()
+            if driver_path and isinstance(driver_path, str):
+                service = FirefoxService(executable_path=driver_path)
+                driver_kwargs["service"] = service
+        except Exception as e:
+            logger.debug(f"Could not use GeckoDriverManager: {e}")
+    
+    return webdriver.Firefox(options=options, **driver_kwargs)
+
+def prewarm_driver_pool(count: Optional[int] = None) -> int:
+    """
+    Start drivers ahead of time so the first product table checks skip browser launch.
+    
+    Args:
+        count: Number of drivers to start (defaults to the pool size)
+        
+    Returns:
+        int: Number of drivers added to the pool
+    """
+    if not _check_browser_availability():
+        return 0
+    
+    started = 0
+    for _ in range(count or _DRIVER_POOL_SIZE):
+        try:
+            if CHROME_AVAILABLE:
+                driver, browser_used = _start_chrome_driver(), "chrome"
+            else:
+                driver, browser_used = _start_firefox_driver(), "firefox"
+        except Exception as e:
+            logger.warning(f"Stopped prewarming WebDriver pool: {e}")
+            break
+        try:
+            _driver_pool.put_nowait((driver, browser_used))
+        except queue.Full:
+            _quit_driver(driver)
+            break
+        started += 1
+    
+    logger.info(f"Prewarmed {started} WebDriver instance(s)")
+    return started
+
 def check_for_product_tables_with_selenium(url: str, timeout: Optional[int] = None) -> Dict[str, Any]:
     """
     Check if a URL's HTML contains product table classes using Selenium with available browsers.
@@ -263,37 +396,18 @@ def check_for_product_tables_with_selenium(url: str, timeout: Optional[int] = No
     
     logger.info(f"Checking for product tables using Selenium on {domain}")
     
-    driver = None
-    browser_used = None
+    driver, browser_used = _acquire_driver()
+    reusable = False
+    if driver is not None:
+        logger.info(f"Reusing pooled {browser_used} driver for {domain}")
     
     try:
         # Try Chrome first if available
-        if CHROME_AVAILABLE:
+        if driver is None and CHROME_AVAILABLE:
             try:
                 logger.info(f"Using Chrome for {domain}")
                 browser_used = "chrome"
-                
-                # Configure Chrome options
-                options = ChromeOptions()
-                options.add_argument("--headless=new")
-                options.add_argument("--disable-gpu")
-                options.add_argument("--no-sandbox")
-                options.add_argument("--disable-dev-shm-usage")
-                
-                # Add user agent to reduce detection as bot
-                options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
-                
-                driver_kwargs = {}
-                if CHROME_WDM_AVAILABLE:
-                    try:
-                        driver_path = ChromeDriverManager().install()
-                        if driver_path and isinstance(driver_path, str):
-                            service = ChromeService(executable_path=driver_path)
-                            driver_kwargs["service"] = service
-                    except Exception as e:
-                        logger.debug(f"Could not use ChromeDriverManager: {e}")
-                
-                driver = webdriver.Chrome(options=options, **driver_kwargs)
+                driver = _start_chrome_driver()
             except Exception as e:
                 logger.warning(f"Failed to initialize Chrome for {domain}: {e}")
                 driver = None
@@ -303,28 +417,7 @@ def check_for_product_tables_with_selenium(url: str, timeout: Optional[int] = No
             try:
                 logger.info(f"Using Firefox for {domain}")
                 browser_used = "firefox"
-                
-                # Configure Firefox options
-                options = FirefoxOptions()
-                options.add_argument("--headless")
-                options.add_argument("--disable-gpu")
-                options.add_argument("--no-sandbox")
-                options.add_argument("--disable-dev-shm-usage")
-                
-                # Add user agent to reduce detection as bot
-                options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Firefox/91.0")
-                
-                driver_kwargs = {}
-                if FIREFOX_WDM_AVAILABLE:
-                    try:
-                        driver_path = GeckoDriverManager().install()
-                        if driver_path and isinstance(driver_path, str):
-                            service = FirefoxService(executable_path=driver_path)
-                            driver_kwargs["service"] = service
-                    except Exception as e:
-                        logger.debug(f"Could not use GeckoDriverManager: {e}")
-                
-                driver = webdriver.Firefox(options=options, **driver_kwargs)
+                driver = _start_firefox_driver()
             except Exception as e:
                 logger.warning(f"Failed to initialize Firefox for {domain}: {e}")
                 return {
@@ -347,6 +440,9 @@ def check_for_product_tables_with_selenium(url: str, timeout: Optional[int] = No
         # Navigate to the URL
         driver.get(url)
         
+        # The page loaded, so the driver can be reused for the next URL
+        reusable = True
+        
         # Wait up to the timeout for the page to load completely
         time.sleep(min(2, timeout / 3))  # Give the page some time to render
         
@@ -513,12 +609,9 @@ def check_for_product_tables_with_selenium(url: str, timeout: Optional[int] = No
             "detection_method": f"selenium_exception"
         }
     finally:
-        # Clean up driver
+        # Return the driver to the pool, or quit it after errors
         if driver:
-            try:
-                driver.quit()
-            except:
-                pass
+            _release_driver(driver, browser_used, reusable)
 
 def check_for_product_tables_selenium_sync(url: str, timeout: Optional[int] = None) -> Dict[str, Any]:
     """
@@ -533,8 +626,11 @@ def check_for_product_tables_selenium_sync(url: str, timeout: Optional[int] = No
     """
     result = {}
     
-    # Use ThreadPoolExecutor to run in a separate thread with a timeout
-    with concurrent.futures.ThreadPoolExecutor() as executor:
+    # Use ThreadPoolExecutor to run in a separate thread with a timeout.
+    # Shut down without waiting, otherwise leaving a with-block would block until the
+    # stuck browser call returns and the timeout below would have no effect.
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    try:
         future = executor.submit(check_for_product_tables_with_selenium, url, timeout)
         try:
             result = future.result(timeout=timeout if timeout else 30)
@@ -552,5 +648,7 @@ def check_for_product_tables_selenium_sync(url: str, timeout: Optional[int] = No
                 "error": f"Thread error: {str(e)[:100]}",
                 "detection_method": "selenium_thread_error"
             }
+    finally:
+        executor.shutdown(wait=False)
     
     return result
\ No newline at end of file
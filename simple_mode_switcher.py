@@ -5,19 +5,62 @@ Now with cloud browser automation support.
 """
 
 import os
-import shutil
+import asyncio
+import atexit
+import datetime
+import functools
+import importlib.util
+import concurrent.futures
+import contextlib
+import contextvars
+import queue
 import tempfile
+import threading
+import time
+from collections import OrderedDict
+from enum import Enum
 import logging
-from typing import Dict, Any, List, Optional
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Any, List, Optional, Tuple
 import json
-from fastapi import FastAPI, UploadFile, File, HTTPException, Query, Body, Request, Header, Form
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, HTMLResponse, FileResponse
+import aiofiles
+import aiofiles.os
+import re
+import sys
+from urllib.parse import urlparse
+from fastapi import FastAPI, UploadFile, File, HTTPException, Query, Body, Request, Header, Form, Depends, BackgroundTasks
+from app_middleware import StaticExemptCORSMiddleware, StreamExemptGZipMiddleware
+from fastapi.responses import JSONResponse, HTMLResponse, FileResponse, StreamingResponse, Response
 from fastapi.staticfiles import StaticFiles
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel, ConfigDict
 from typing import Optional, List, Dict, Any
 import email_qa_enhanced
 from email_qa_enhanced import validate_email
 from runtime_config import config
+from batch_processor import BatchValidationRequest, EnhancedBatchValidationRequest, batch_processor, TEMP_ROOT
+from locale_config import LOCALE_CONFIGS, generate_locale_requirements, get_locale_config
+
+# Use orjson for JSON responses when it is installed
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse as FastJSONResponse
+    ORJSON_AVAILABLE = True
+except ImportError:
+    FastJSONResponse = JSONResponse
+    ORJSON_AVAILABLE = False
+
+# Use the libuv-based event loop when uvloop is installed (Linux/macOS)
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logging.info("uvloop event loop policy installed")
+except ImportError:
+    pass
+
+# Environment facts that are fixed for the lifetime of the process
+_IS_REPLIT = os.environ.get('REPL_ID') is not None or os.environ.get('REPLIT_ENVIRONMENT') is not None
+_IS_DEPLOYMENT = os.environ.get('DEPLOYMENT_MODE') == 'production' or os.environ.get('SKIP_BROWSER_CHECK') == 'true'
 
 # Import cloud browser API endpoints module
 try:
@@ -29,14 +72,58 @@ except ImportError:
     api_router = None  # Set it to None to avoid "possibly unbound" error
     logging.warning("Cloud API endpoints module not available")
 
-# Import cloud browser API test module if available
-try:
-    import cloud_api_test
-    CLOUD_API_TEST_AVAILABLE = True
-    logging.info("Cloud API test module loaded successfully")
-except ImportError:
-    CLOUD_API_TEST_AVAILABLE = False
-    logging.warning("Cloud API test module not available")
+# URL markers for local test servers; the showcase site only counts as a test domain in development
+_SHOWCASE_HOST = 'partly-products-showcase.lovable.app'
+_TEST_HOSTS = {
+    'production': frozenset(('localhost:5001', '127.0.0.1:5001')),
+    'development': frozenset((_SHOWCASE_HOST, 'localhost:5001', '127.0.0.1:5001')),
+}
+_BOT_SIMULATE_RE = re.compile(r'simulate=bot_blocked|bot_blocked=true')
+_PRODUCT_PATH_RE = re.compile(r'/products?/|/products\Z')
+
+# Error-message markers of bot protection, matched in a single scan
+_BOT_RE = re.compile(r'captcha|security|cloudflare|challenge|blocked|denied|bot|protection|automated|detection', re.I)
+_ERROR_BOT_RE = re.compile(r'captcha|bot', re.I)
+
+@functools.lru_cache(maxsize=4096)
+def _url_host(url):
+    """Lower-cased host[:port] of a URL, without any user info; scheme-less URLs are read as host first."""
+    return urlparse(url if '//' in url else '//' + url).netloc.rpartition('@')[2].lower()
+
+@functools.lru_cache(maxsize=4096)
+def _classify_url(url, mode):
+    """
+    Classify a URL for product table checks.
+    Test domains are matched on the URL's host only, so paths and query strings are never scanned.
+    
+    Returns:
+        tuple: (is_test_domain, simulate_bot)
+    """
+    test_hosts = _TEST_HOSTS['production' if mode == 'production' else 'development']
+    is_test_domain = _url_host(url) in test_hosts
+    # The bot simulation marker only matters on test domains, and both spellings contain 'bot_blocked'
+    simulate_bot = is_test_domain and 'bot_blocked' in url and _BOT_SIMULATE_RE.search(url) is not None
+    return is_test_domain, simulate_bot
+
+class UrlKind(Enum):
+    """How a product table check handles a URL; each kind has one handler in _URL_HANDLERS."""
+    DEV_TEST_SIM = 'dev_test_sim'
+    DEV_TEST_BOT_SIM = 'dev_test_bot_sim'
+    PROD_PARTLY = 'prod_partly'
+    GENERIC = 'generic'
+
+@functools.lru_cache(maxsize=4096)
+def _url_kind(url, mode):
+    """
+    Decide once how a URL is checked in the given mode.
+    In production, partly-products-showcase.lovable.app is checked for real instead of simulated.
+    """
+    is_test_domain, simulate_bot = _classify_url(url, mode)
+    if mode == 'development' and is_test_domain:
+        return UrlKind.DEV_TEST_BOT_SIM if simulate_bot else UrlKind.DEV_TEST_SIM
+    if _url_host(url) == _SHOWCASE_HOST:
+        return UrlKind.PROD_PARTLY
+    return UrlKind.GENERIC
 
 # Import browser automation module
 # Define a fallback function in case the real one isn't available
@@ -46,18 +133,12 @@ def browser_check_fallback(url, timeout=None):
     Preserves the bot_blocked flag when falling back from HTTP checks.
     """
     # If we're in development mode and this is a test domain, we can simulate responses
-    from urllib.parse import urlparse
-    parsed_url = urlparse(url)
-    domain = parsed_url.netloc
-    
-    if config.mode == 'development' and (
-        'partly-products-showcase.lovable.app' in domain or 
-        'localhost:5001' in domain or 
-        '127.0.0.1:5001' in domain
-    ):
+    is_test_domain, simulate_bot = _classify_url(url, config.mode)
+    
+    if config.mode == 'development' and is_test_domain:
         # Simulate bot blocked if requested in URL params
-        if 'simulate=bot_blocked' in url or 'bot_blocked=true' in url:
-            logging.info(f"Simulating bot blocked in fallback for: {url}")
+        if simulate_bot:
+            logging.info("Simulating bot blocked in fallback for: %s", url)
             return {
                 'found': False,
                 'error': "Simulated bot protection (development mode)",
@@ -66,7 +147,7 @@ def browser_check_fallback(url, timeout=None):
             }
         else:
             # Simulate success for test domains in development mode
-            logging.info(f"Simulating product table found in fallback for: {url}")
+            logging.info("Simulating product table found in fallback for: %s", url)
             return {
                 'found': True,
                 'class_name': 'product-table',
@@ -82,54 +163,251 @@ def browser_check_fallback(url, timeout=None):
         'bot_blocked': False
     }
 
-# Check for text analysis availability
+def text_analysis_fallback(url):
+    """Fallback function when the text analysis module is not available."""
+    logging.warning("Text analysis called but not available for %s", url)
+    return {
+        'found': False,
+        'error': "Text analysis module not available",
+        'detection_method': 'text_analysis_unavailable',
+        'confidence_score': 0
+    }
+
+# Heavy detection modules (Selenium, web scraping) are imported on first use
+# so processes that only serve pages or /config never pay for them
 TEXT_ANALYSIS_AVAILABLE = False
-try:
-    from web_scraper import check_for_product_tables_with_text_analysis
-    TEXT_ANALYSIS_AVAILABLE = True
-    logging.info("Text analysis module loaded successfully - enhanced detection available in mode switcher")
-except ImportError:
-    logging.warning("Text analysis module not available in mode switcher - some advanced detection features will be disabled")
-    
-    # Define a fallback function to prevent unbound errors
-    def check_for_product_tables_with_text_analysis(url):
-        logging.warning(f"Text analysis called but not available for {url}")
-        return {
-            'found': False,
-            'error': "Text analysis module not available",
-            'detection_method': 'text_analysis_unavailable',
-            'confidence_score': 0
-        }
+check_for_product_tables_with_text_analysis = text_analysis_fallback  # Default to fallback
+_text_analysis_loaded = False
 
-# Try to import the Selenium browser check function with deployment-aware loading
 BROWSER_AUTOMATION_AVAILABLE = False
 browser_check = browser_check_fallback  # Default to fallback
+check_browser_availability = None
+_browser_automation_loaded = False
 
-# Skip expensive browser imports in deployment mode to speed up startup
-if os.environ.get("SKIP_BROWSER_CHECK") != "true" and os.environ.get("DEPLOYMENT_MODE") != "production":
+def _load_text_analysis():
+    """Import the text analysis module on first use and remember the outcome."""
+    global TEXT_ANALYSIS_AVAILABLE, check_for_product_tables_with_text_analysis, _text_analysis_loaded
+    if _text_analysis_loaded:
+        return TEXT_ANALYSIS_AVAILABLE
+    
     try:
-        from selenium_automation import check_for_product_tables_selenium_sync as browser_check
-        BROWSER_AUTOMATION_AVAILABLE = True
-        logging.info("Selenium browser automation module loaded successfully")
+        from web_scraper import check_for_product_tables_with_text_analysis
+        TEXT_ANALYSIS_AVAILABLE = True
+        logging.info("Text analysis module loaded successfully - enhanced detection available in mode switcher")
     except ImportError:
-        browser_check = browser_check_fallback  # Use the fallback function
-        BROWSER_AUTOMATION_AVAILABLE = False
-        logging.warning("Browser automation module not available. Using HTTP-only checks.")
-else:
-    logging.info("Skipping browser automation import in deployment mode for faster startup")
+        check_for_product_tables_with_text_analysis = text_analysis_fallback
+        TEXT_ANALYSIS_AVAILABLE = False
+        logging.warning("Text analysis module not available in mode switcher - some advanced detection features will be disabled")
+    
+    _text_analysis_loaded = True
+    return TEXT_ANALYSIS_AVAILABLE
+
+def _load_browser_automation():
+    """Import the Selenium browser check function on first use, with deployment-aware loading."""
+    global BROWSER_AUTOMATION_AVAILABLE, browser_check, check_browser_availability, _browser_automation_loaded
+    if _browser_automation_loaded:
+        return BROWSER_AUTOMATION_AVAILABLE
+    
+    # Skip expensive browser imports in deployment mode
+    if not _IS_DEPLOYMENT:
+        try:
+            from selenium_automation import check_for_product_tables_selenium_sync as browser_check
+            from selenium_automation import check_browser_availability
+            BROWSER_AUTOMATION_AVAILABLE = True
+            logging.info("Selenium browser automation module loaded successfully")
+        except ImportError:
+            browser_check = browser_check_fallback  # Use the fallback function
+            check_browser_availability = None
+            BROWSER_AUTOMATION_AVAILABLE = False
+            logging.warning("Browser automation module not available. Using HTTP-only checks.")
+    else:
+        logging.info("Skipping browser automation import in deployment mode")
+    
+    _browser_automation_loaded = True
+    return BROWSER_AUTOMATION_AVAILABLE
+
+def _browser_automation_installed():
+    """
+    Report whether browser automation can be used without importing Selenium.
+    Uses importlib.util.find_spec until the real module has been loaded by a detection request.
+    """
+    if _browser_automation_loaded:
+        return BROWSER_AUTOMATION_AVAILABLE
+    return _browser_modules_present()
+
+@functools.lru_cache(maxsize=1)
+def _browser_modules_present():
+    """Check once whether the Selenium automation modules are importable."""
+    if _IS_DEPLOYMENT:
+        return False
+    return all(importlib.util.find_spec(name) is not None for name in ("selenium", "selenium_automation"))
+
+# Crawlers must not trigger browser automation or batch validation
+_BOT_UA_RE = re.compile(r'bot|crawler|spider|crawling', re.I)
+
+def _reject_bot_user_agent(request: Request):
+    """Dependency for expensive endpoints: answer known crawler user agents with 403."""
+    user_agent = request.headers.get('user-agent', '')
+    if _BOT_UA_RE.search(user_agent):
+        logger.info("Rejected crawler request to %s (User-Agent: %s)", request.url.path, user_agent)
+        raise HTTPException(status_code=403, detail="Automated crawlers are not allowed on this endpoint")
+
+_REJECT_BOTS = [Depends(_reject_bot_user_agent)]
+
+# Maximum number of URLs from a single request checked at the same time
+_DETECTION_CONCURRENCY = 8
+
+# Seconds allowed beyond the requested timeout before a URL check is abandoned
+_URL_DEADLINE_GRACE = 5
+
+# Shared worker pool for blocking per-URL detection work, reused across requests
+_DETECTION_POOL = concurrent.futures.ThreadPoolExecutor(
+    max_workers=min(32, (os.cpu_count() or 1) + 4),
+    thread_name_prefix="product-table-check"
+)
+
+# Text analysis for the showcase domain runs alongside the HTTP/browser checks; kept separate from
+# _DETECTION_POOL so a detection worker never waits on a task queued behind itself
+_TEXT_ANALYSIS_POOL = concurrent.futures.ThreadPoolExecutor(
+    max_workers=_DETECTION_CONCURRENCY,
+    thread_name_prefix="text-analysis"
+)
+
+# /run-qa validation (HTML parsing, link and image checks) is blocking, so it runs here instead of on the event loop
+_VALIDATION_POOL = concurrent.futures.ThreadPoolExecutor(
+    max_workers=int(os.environ.get('RUN_QA_WORKERS', 8)),
+    thread_name_prefix="run-qa-validate"
+)
+
+# Import cloud detection once instead of on every product-path URL
+try:
+    from cloud_browser_automation import check_for_product_tables_cloud
+except ImportError:
+    check_for_product_tables_cloud = None
+    logging.warning("Cloud browser automation module not available in mode switcher")
 
 # Set up logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+def _configure_queue_logging():
+    """
+    Route root logging through a QueueHandler drained by a background QueueListener,
+    so request handlers never block on the stderr lock while writing log records.
+    Handlers already installed on the root logger are moved onto the listener.
+    """
+    root = logging.getLogger()
+    if any(isinstance(handler, QueueHandler) for handler in root.handlers):
+        return None
+    
+    handlers = root.handlers[:]
+    if not handlers:
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+        handlers = [stream_handler]
+    for handler in handlers:
+        root.removeHandler(handler)
+    
+    log_queue = queue.Queue(-1)
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(logging.INFO)
+    
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    # main.py merges our routes but not our lifecycle events, so flush at interpreter exit
+    atexit.register(listener.stop)
+    return listener
+
+_log_listener = _configure_queue_logging()
 logger = logging.getLogger(__name__)
 
+def _encode_json(content):
+    """Encode content to compact UTF-8 JSON, using orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+def _parse_json(data):
+    """
+    Parse JSON from str or bytes, using orjson when it is installed.
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers keep catching the stdlib error.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+# Request bodies at least this large are parsed in a worker thread
+_JSON_OFFLOAD_THRESHOLD = 64 * 1024
+
+async def _parse_json_async(data):
+    """Parse JSON like _parse_json, moving large documents off the event loop."""
+    if len(data) >= _JSON_OFFLOAD_THRESHOLD:
+        return await asyncio.to_thread(_parse_json, data)
+    return _parse_json(data)
+
+# Short form fields (locale mappings, selected locales) repeat across UI-driven batches
+_FORM_JSON_CACHE_MAX_LENGTH = 4096
+
+@functools.lru_cache(maxsize=128)
+def _parse_form_json_cached(text):
+    return _parse_json(text)
+
+def _parse_form_json(text):
+    """
+    Parse a small JSON form field, memoizing recent values.
+    The result is shared between requests, so callers must treat it as read-only.
+    """
+    if len(text) <= _FORM_JSON_CACHE_MAX_LENGTH:
+        return _parse_form_json_cached(text)
+    return _parse_json(text)
+
+def _dump_json_pretty(content):
+    """Indented JSON text for debug logging."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(content, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(content, indent=2)
+
+def _json_response(content):
+    """
+    Render content straight to a JSON response, skipping jsonable_encoder when orjson can encode it.
+    orjson serializes datetimes natively, so batch payloads can carry raw start/end times.
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return FastJSONResponse(content=content)
+        except TypeError:
+            # orjson.JSONEncodeError subclasses TypeError; fall back for values it cannot encode
+            pass
+    return FastJSONResponse(content=jsonable_encoder(content))
+
+def _iter_results_json(results):
+    """
+    Encode a {"results": ...} payload one top-level key at a time.
+    Lets large validation responses start streaming before the whole body is serialized.
+    """
+    yield b'{"results":{'
+    for index, (key, value) in enumerate(results.items()):
+        try:
+            chunk = _encode_json({key: value})
+        except TypeError:
+            # Same fallback as _json_response; the status line is already sent, so a failure here would truncate the body
+            chunk = _encode_json(jsonable_encoder({key: value}))
+        chunk = chunk[1:-1]
+        yield b"," + chunk if index else chunk
+    yield b"}}"
+
 # Create FastAPI app
-app = FastAPI(title="Email QA Automation API")
+# Endpoints that return plain dicts (batch results, progress, locale previews) are rendered with orjson when available
+app = FastAPI(title="Email QA Automation API", default_response_class=FastJSONResponse)
 
-# Configure CORS with more aggressive settings for deployment environments
+# Configure CORS with more aggressive settings for deployment environments;
+# requests for the static mounts skip it
 app.add_middleware(
-    CORSMiddleware,
+    StaticExemptCORSMiddleware,
     allow_origins=["*"],
-    allow_origin_regex=".*",
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -137,31 +415,45 @@ app.add_middleware(
     max_age=3600,
 )
 
+# Compress larger JSON bodies (/run-qa results, batch results) for clients that accept gzip
+app.add_middleware(StreamExemptGZipMiddleware, minimum_size=1024, compresslevel=6)
+
+def prewarm_browser_drivers():
+    """
+    Start the Selenium driver pool in the background when SELENIUM_PREWARM_DRIVERS=true,
+    so the first product table checks reuse warm browsers instead of launching them.
+    Registered as a startup handler here and on main.app, which serves these routes in deployment.
+    """
+    if os.environ.get('SELENIUM_PREWARM_DRIVERS', '').lower() not in ('1', 'true', 'yes') or _IS_DEPLOYMENT:
+        return
+    if not _load_browser_automation():
+        return
+    from selenium_automation import prewarm_driver_pool
+    threading.Thread(target=prewarm_driver_pool, name="webdriver-prewarm", daemon=True).start()
+
+app.add_event_handler("startup", prewarm_browser_drivers)
+
 # Include cloud browser API endpoints router if available
 if CLOUD_API_ENDPOINTS_AVAILABLE and api_router is not None:
     try:
         app.include_router(api_router, prefix="/api/cloud")
         logging.info("Cloud browser API endpoints added to FastAPI application")
     except Exception as e:
-        logging.error(f"Failed to include cloud browser API endpoints: {e}")
+        logging.error("Failed to include cloud browser API endpoints: %s", e)
 
-# Mount static files
-app.mount("/static", StaticFiles(directory="static"), name="static")
-
-# Mount attached assets
-app.mount("/attached_assets", StaticFiles(directory="attached_assets"), name="attached_assets")
+# Mount static files unless a CDN or reverse proxy serves them (SKIP_STATIC_MOUNT=true)
+# check_dir=False skips the directory validation at import time
+if os.environ.get('SKIP_STATIC_MOUNT', '').lower() not in ('1', 'true', 'yes'):
+    app.mount("/static", StaticFiles(directory="static", check_dir=False), name="static")
+    
+    # Mount attached assets
+    app.mount("/attached_assets", StaticFiles(directory="attached_assets", check_dir=False), name="attached_assets")
 
-@app.get("/")
-async def read_root():
-    """Serve the frontend application with mode indicator."""
-    with open("static/index.html", "r") as f:
-        html_content = f.read()
-        
-    # Add mode indicator to the UI
-    mode = config.mode
+def _build_mode_indicator(mode):
+    """Build the floating mode indicator shown in the bottom-right corner of the UI."""
     color = "#e53e3e" if mode == "production" else "#3182ce"
     
-    mode_indicator = f"""
+    return f"""
     <div style="position: fixed; bottom: 10px; right: 10px; 
          background-color: {color}; 
          color: white; padding: 6px 12px; border-radius: 4px; 
@@ -173,142 +465,271 @@ async def read_root():
         </a>
     </div>
     """
+
+# The indicator only depends on the mode, so build both variants once
+_MODE_INDICATORS = {mode: _build_mode_indicator(mode) for mode in ("development", "production")}
+
+_INDEX_PATH = "static/index.html"
+
+# Rendered index.html bytes keyed by mode; both variants stay valid until index.html changes
+_INDEX_CACHE: Dict[str, bytes] = {}
+
+# Static HTML pages read so far, keyed by path, with the mtime they were read at
+_STATIC_PAGES: Dict[str, Tuple[int, str]] = {}
+
+async def _load_static(path):
+    """Read a static HTML page once, without blocking the event loop, and keep it in memory."""
+    entry = _STATIC_PAGES.get(path)
+    if entry is None:
+        mtime = (await aiofiles.os.stat(path)).st_mtime_ns
+        async with aiofiles.open(path, "r", encoding="utf-8") as f:
+            page = await f.read()
+        entry = _STATIC_PAGES[path] = (mtime, page)
+    return entry[1]
+
+async def _drop_stale_static_pages():
+    """Forget cached pages whose file changed on disk since it was read (checked on /set-mode)."""
+    for path, (mtime, _) in list(_STATIC_PAGES.items()):
+        try:
+            current = (await aiofiles.os.stat(path)).st_mtime_ns
+        except OSError:
+            current = None
+        if current != mtime:
+            del _STATIC_PAGES[path]
+            if path == _INDEX_PATH:
+                _INDEX_CACHE.clear()
+
+def _render_index(mode, template):
+    """
+    Render index.html for a mode in a single pass.
+    Adds a data-mode attribute to the body tag for JavaScript detection and
+    inserts the mode indicator before the closing body tag.
+    """
+    head, body_tag, rest = template.partition("<body")
+    if not body_tag:
+        head, rest = "", head
+    main, close_tag, tail = rest.partition("</body>")
     
-    # Add data-mode attribute to the body tag for JavaScript detection
-    html_content = html_content.replace("<body", f"<body data-mode=\"{mode}\"")
+    return "".join((
+        head,
+        body_tag,
+        f' data-mode="{mode}"' if body_tag else "",
+        main,
+        _MODE_INDICATORS[mode] if close_tag else "",
+        close_tag,
+        tail,
+    )).encode("utf-8")
+
+@app.get("/")
+async def read_root():
+    """Serve the frontend application with mode indicator."""
+    mode = config.mode
+    html_content = _INDEX_CACHE.get(mode)
     
-    # Insert the mode indicator before the closing body tag
-    html_content = html_content.replace("</body>", f"{mode_indicator}</body>")
+    if html_content is None:
+        html_content = _render_index(mode, await _load_static(_INDEX_PATH))
+        _INDEX_CACHE[mode] = html_content
     
     return HTMLResponse(content=html_content, status_code=200)
 
+# Serialized /debug/routes body and the route count it was built from
+_ROUTES_BODY_CACHE = {"count": None, "body": b""}
+
 @app.get("/debug/routes")
 async def debug_routes():
     """Debug endpoint to list all available routes."""
-    routes = []
-    for route in app.routes:
-        try:
-            if hasattr(route, 'path') and hasattr(route, 'methods'):
-                routes.append({
-                    'path': getattr(route, 'path', 'unknown'),
-                    'methods': list(getattr(route, 'methods', [])),
-                    'name': getattr(route, 'name', 'unnamed')
-                })
-        except:
-            pass
-    return {"routes": routes}
+    # Routes are only registered at import time; rebuild only if the count ever changes
+    route_count = len(app.routes)
+    if _ROUTES_BODY_CACHE["count"] != route_count:
+        routes = []
+        for route in app.routes:
+            try:
+                if hasattr(route, 'path') and hasattr(route, 'methods'):
+                    routes.append({
+                        'path': getattr(route, 'path', 'unknown'),
+                        'methods': list(getattr(route, 'methods', [])),
+                        'name': getattr(route, 'name', 'unnamed')
+                    })
+            except:
+                pass
+        _ROUTES_BODY_CACHE["body"] = _encode_json({"routes": routes})
+        _ROUTES_BODY_CACHE["count"] = route_count
+    return Response(content=_ROUTES_BODY_CACHE["body"], media_type="application/json")
+
+# Constant response body, serialized once
+_TEST_ENHANCED_BATCH_BODY = _encode_json({
+    "status": "ok",
+    "message": "Enhanced batch endpoint routing is working",
+    "available_endpoints": [
+        "/api/enhanced-batch-validate",
+        "/api/enhanced_batch_validate", 
+        "/enhanced-batch-validate",
+        "/enhanced_batch_validate"
+    ]
+})
 
 @app.get("/api/test-enhanced-batch")
 async def test_enhanced_batch():
     """Test endpoint to verify enhanced batch routing works in production."""
-    return {
-        "status": "ok",
-        "message": "Enhanced batch endpoint routing is working",
-        "available_endpoints": [
-            "/api/enhanced-batch-validate",
-            "/api/enhanced_batch_validate", 
-            "/enhanced-batch-validate",
-            "/enhanced_batch_validate"
-        ]
-    }
+    return Response(content=_TEST_ENHANCED_BATCH_BODY, media_type="application/json")
 
 @app.get("/test")
 async def test_page():
     """Serve a simple test page directly."""
-    with open("static/simple.html", "r") as f:
-        html_content = f.read()
+    html_content = await _load_static("static/simple.html")
     return HTMLResponse(content=html_content, status_code=200)
 
-@app.get("/config")
-@app.get("/api/config")
-async def get_config():
-    """Get current configuration settings with optimized checks for deployment."""
-    # For deployment environments, optimize configuration loading
-    cloud_browser_available = False
-    
-    # Fast check if we're in Replit or deployment mode
-    is_replit = os.environ.get('REPL_ID') is not None or os.environ.get('REPLIT_ENVIRONMENT') is not None
-    is_deployment = os.environ.get('DEPLOYMENT_MODE') == 'production' or os.environ.get('SKIP_BROWSER_CHECK') == 'true'
-    
-    if is_replit or is_deployment:
-        # In deployment environments, only check for API keys, not for browser installation
-        scrapingbee_key = os.environ.get('SCRAPINGBEE_API_KEY', '')
-        browserless_key = os.environ.get('BROWSERLESS_API_KEY', '')
-        cloud_browser_available = bool(scrapingbee_key or browserless_key)
-        logger.info(f"Deployment environment detected, using cloud browser availability: {cloud_browser_available}")
-    else:
-        # Only in development environments, check traditionally (with timeout)
+def _sanitize_test_domains(test_domains):
+    """
+    Create a JSON-safe copy of the configured test domains.
+    The test_domains might include complex objects that aren't JSON serializable.
+    """
+    test_domains_safe = {}
+    if not test_domains:
+        return test_domains_safe
+    
+    if isinstance(test_domains, dict):
+        # Simple copy of dictionary - exclude any complex objects
+        for domain, info in test_domains.items():
+            if isinstance(info, dict):
+                test_domains_safe[domain] = {
+                    k: v for k, v in info.items() 
+                    if isinstance(v, (str, int, float, bool, list)) or v is None
+                }
+            else:
+                # If not a dict, only include if it's a simple type
+                if isinstance(info, (str, int, float, bool)) or info is None:
+                    test_domains_safe[domain] = info
+    elif isinstance(test_domains, (list, tuple)):
+        # If it's a list, convert to a simple dictionary
+        test_domains_safe = {domain: True for domain in test_domains}
+    return test_domains_safe
+
+# Sanitized test domains, recomputed only when config.test_domains is replaced (on mode change).
+# The source object is held so its identity can't be reused by a newer object.
+_TEST_DOMAINS_CACHE = {"source": None, "value": {}}
+
+def _get_test_domains_safe():
+    """Return the cached JSON-safe test domains for the current configuration."""
+    test_domains = getattr(config, 'test_domains', None)
+    if _TEST_DOMAINS_CACHE["source"] is not test_domains:
         try:
-            from browser_detection import check_cloud_browser_available
-            cloud_browser_available = check_cloud_browser_available()
+            value = _sanitize_test_domains(test_domains)
         except Exception as e:
-            logger.error(f"Error checking cloud browser availability: {str(e)}")
-            cloud_browser_available = False
+            logger.error("Error processing test domains for config response: %s", e)
+            value = {}
+        _TEST_DOMAINS_CACHE["source"] = test_domains
+        _TEST_DOMAINS_CACHE["value"] = value
+    return _TEST_DOMAINS_CACHE["value"]
+
+# Response schemas for the OpenAPI docs. The handlers below return pre-encoded orjson
+# responses, which FastAPI passes through without re-validating them against these models.
+class ConfigResponse(BaseModel):
+    """Body of GET /config."""
+    model_config = ConfigDict(extra="allow")
     
-    # In deployment environments, prioritize cloud browser availability
-    browser_automation_available = cloud_browser_available if (is_replit or is_deployment) else (BROWSER_AUTOMATION_AVAILABLE or cloud_browser_available)
+    mode: str
+    enable_test_redirects: Optional[bool] = None
+    product_table_timeout: Optional[int] = None
+    request_timeout: Optional[int] = None
+    max_retries: Optional[int] = None
+    test_domains: Optional[Any] = None
+    browser_automation_available: bool
+    cloud_browser_available: bool
+    is_deployment: Optional[bool] = None
+    error: Optional[str] = None
+
+class ProductTableResult(BaseModel):
+    """Detection result for one URL; detection methods add their own extra fields."""
+    model_config = ConfigDict(extra="allow")
+    
+    found: Optional[bool] = None
+    class_name: Optional[str] = None
+    detection_method: Optional[str] = None
+    bot_blocked: Optional[bool] = None
+    is_test_domain: Optional[bool] = None
+    error: Optional[str] = None
+
+class CheckProductTablesResponse(BaseModel):
+    """Body of POST /api/check-product-tables, keyed by URL."""
+    results: Dict[str, ProductTableResult]
+
+# Serialized /config body and the live settings it was built from; the UI polls this endpoint
+_CONFIG_BODY_CACHE = {"key": None, "body": b""}
+
+@app.get("/config", response_model=ConfigResponse)
+@app.get("/api/config", include_in_schema=False)
+async def get_config():
+    """Get current configuration settings with optimized checks for deployment."""
     
-    # Check if this is a deployment environment (Replit production)
-    is_deployment = os.environ.get("REPL_SLUG") is not None and os.environ.get("REPL_OWNER") is not None
+    # Cloud browser availability is determined by API keys alone in every environment
+    # (browser_detection.check_cloud_browser_available() checks the same variables).
+    # RuntimeConfig keeps the keys current when they are changed through the cloud API endpoints.
+    scrapingbee_key = getattr(config, 'scrapingbee_key', '')
+    browserless_key = getattr(config, 'browserless_key', '')
+    cloud_browser_available = bool(scrapingbee_key or browserless_key)
+    
+    # In deployment environments, prioritize cloud browser availability
+    browser_automation_available = cloud_browser_available if (_IS_REPLIT or _IS_DEPLOYMENT) else (_browser_automation_installed() or cloud_browser_available)
     
     # Create safe version of the test domains for response
-    # The test_domains might include complex objects that aren't JSON serializable
-    try:
-        # Convert test domains to a simpler format if needed
-        test_domains_safe = {}
-        if hasattr(config, 'test_domains') and config.test_domains:
-            if isinstance(config.test_domains, dict):
-                # Simple copy of dictionary - exclude any complex objects
-                for domain, info in config.test_domains.items():
-                    if isinstance(info, dict):
-                        test_domains_safe[domain] = {
-                            k: v for k, v in info.items() 
-                            if isinstance(v, (str, int, float, bool, list)) or v is None
-                        }
-                    else:
-                        # If not a dict, only include if it's a simple type
-                        if isinstance(info, (str, int, float, bool)) or info is None:
-                            test_domains_safe[domain] = info
-            elif isinstance(config.test_domains, (list, tuple)):
-                # If it's a list, convert to a simple dictionary
-                test_domains_safe = {domain: True for domain in config.test_domains}
-    except Exception as e:
-        logger.error(f"Error processing test domains for config response: {str(e)}")
-        test_domains_safe = {}
+    test_domains_safe = _get_test_domains_safe()
+    
+    # Only re-encode when one of the reported settings has changed
+    key = (
+        config.mode,
+        config.enable_test_redirects,
+        getattr(config, 'product_table_timeout', 30),
+        getattr(config, 'request_timeout', 10),
+        getattr(config, 'max_retries', 3),
+        test_domains_safe,
+        browser_automation_available,
+        cloud_browser_available,
+        config.is_deployment_env
+    )
+    if _CONFIG_BODY_CACHE["key"] == key:
+        return Response(content=_CONFIG_BODY_CACHE["body"], media_type="application/json")
+    
+    if _IS_REPLIT or _IS_DEPLOYMENT:
+        logger.info("Deployment environment detected, using cloud browser availability: %s", cloud_browser_available)
     
     # Create a safe response with only JSON-serializable data
     config_data = {
-        "mode": config.mode,
-        "enable_test_redirects": config.enable_test_redirects,
-        "product_table_timeout": getattr(config, 'product_table_timeout', 30),
-        "request_timeout": getattr(config, 'request_timeout', 10),
-        "max_retries": getattr(config, 'max_retries', 3),
+        "mode": key[0],
+        "enable_test_redirects": key[1],
+        "product_table_timeout": key[2],
+        "request_timeout": key[3],
+        "max_retries": key[4],
         "test_domains": test_domains_safe,
         "browser_automation_available": browser_automation_available,
         "cloud_browser_available": cloud_browser_available,
-        "is_deployment": is_deployment
+        "is_deployment": key[8]
     }
     
     try:
-        return JSONResponse(content=config_data)
+        body = _encode_json(config_data)
     except Exception as e:
-        logger.error(f"Error creating config response: {str(e)}")
+        logger.error("Error creating config response: %s", e)
         # Fallback minimal response
-        return JSONResponse(content={
+        return FastJSONResponse(content={
             "mode": config.mode,
             "browser_automation_available": browser_automation_available,
             "cloud_browser_available": cloud_browser_available,
             "error": f"Config error: {str(e)}"
         })
+    
+    _CONFIG_BODY_CACHE["key"] = key
+    _CONFIG_BODY_CACHE["body"] = body
+    return Response(content=body, media_type="application/json")
 
 @app.get("/api/cloud-browser-status")
-@app.get("/api/cloud/browser-status")  # Added path that matches the router prefix for compatibility
+@app.get("/api/cloud/browser-status", include_in_schema=False)  # Added path that matches the router prefix for compatibility
 async def get_cloud_browser_status():
     """Get the status of cloud browser APIs."""
     try:
         # Simple check for API keys without importing cloud_api_test
-        scrapingbee_key = os.environ.get('SCRAPINGBEE_API_KEY', '')
-        browserless_key = os.environ.get('BROWSERLESS_API_KEY', '')
+        scrapingbee_key = getattr(config, 'scrapingbee_key', '')
+        browserless_key = getattr(config, 'browserless_key', '')
         
         services = {
             "scrapingbee": {
@@ -323,14 +744,14 @@ async def get_cloud_browser_status():
             }
         }
         
-        return JSONResponse(content={
+        return FastJSONResponse(content={
             "status": "success",
             "cloud_browser_available": bool(scrapingbee_key or browserless_key),
             "services": services
         })
     except Exception as e:
-        logger.error(f"Error getting cloud browser status: {str(e)}")
-        return JSONResponse(content={
+        logger.error("Error getting cloud browser status: %s", e)
+        return FastJSONResponse(content={
             "status": "error",
             "message": f"Error getting cloud browser status: {str(e)}"
         })
@@ -352,59 +773,62 @@ async def debug_scrapingbee():
         debug_data['target_classes'] = ["product-table", "productListContainer", "noPartsPhrase"]
         
         # Add timestamp information
-        import datetime
         debug_data['debug_timestamp'] = datetime.datetime.now().isoformat()
         
-        return JSONResponse(content=debug_data)
+        return FastJSONResponse(content=debug_data)
     except ImportError as e:
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=404,
             content={"error": f"Cloud browser automation module not available: {str(e)}"}
         )
     except Exception as e:
-        logger.error(f"Error getting ScrapingBee debug data: {str(e)}")
-        return JSONResponse(
+        logger.error("Error getting ScrapingBee debug data: %s", e)
+        return FastJSONResponse(
             status_code=500, 
             content={"error": f"Failed to get ScrapingBee debug data: {str(e)}"}
         )
 
-@app.get("/api/production-domain-status")
-@app.get("/production-domain-status")
-async def production_domain_status(request: Request):
-    """Special diagnostic endpoint for production domains."""
-    # Check if this is an HTML request (Accept header contains text/html)
-    accept_header = request.headers.get('accept', '')
-    if 'text/html' in accept_header:
-        # Return the HTML page
-        with open("static/domain-status.html", "r") as f:
-            html_content = f.read()
-        return HTMLResponse(content=html_content, status_code=200)
+@functools.lru_cache(maxsize=4)
+def _production_status_base(mode, test_redirects_enabled):
+    """Build the mode-dependent part of the production domain diagnostic response."""
     # This endpoint helps debug issues in the deployed environment
     partly_showcase_url = "https://partly-products-showcase.lovable.app"
     
     # Check if we're in production mode
-    is_production = config.mode == 'production'
+    is_production = mode == 'production'
     
     # In production, partly-products-showcase.lovable.app should NOT be considered a test domain
-    if config.mode == 'production':
+    if mode == 'production':
         is_test_domain = False
     else:
         # In development mode, treat partly-products-showcase.lovable.app as a test domain
         is_test_domain = True
     
-    import datetime
-    
-    # Return comprehensive diagnostic info
-    return JSONResponse(content={
-        "mode": config.mode,
+    return {
+        "mode": mode,
         "is_production": is_production,
         "partly_showcase_url": partly_showcase_url,
         "is_test_domain": is_test_domain,
-        "test_redirects_enabled": config.enable_test_redirects,
+        "test_redirects_enabled": test_redirects_enabled,
         "expect_bot_protection": is_production and not is_test_domain,
-        "should_display_as": "Check blocked (orange)" if (is_production and not is_test_domain) else "Yes (green)",
-        "timestamp": datetime.datetime.now().isoformat()
-    })
+        "should_display_as": "Check blocked (orange)" if (is_production and not is_test_domain) else "Yes (green)"
+    }
+
+@app.get("/api/production-domain-status")
+@app.get("/production-domain-status", include_in_schema=False)
+async def production_domain_status(request: Request):
+    """Special diagnostic endpoint for production domains."""
+    # Check if this is an HTML request (Accept header contains text/html)
+    accept_header = request.headers.get('accept', '')
+    if 'text/html' in accept_header:
+        # Return the HTML page
+        html_content = await _load_static("static/domain-status.html")
+        return HTMLResponse(content=html_content, status_code=200)
+    # Only the timestamp changes between requests for a given mode
+    base = _production_status_base(config.mode, config.enable_test_redirects)
+    
+    # Return comprehensive diagnostic info
+    return _json_response({**base, "timestamp": datetime.datetime.now()})
 
 @app.get("/set-mode/{mode}")
 async def set_mode(mode: str):
@@ -422,6 +846,9 @@ async def set_mode(mode: str):
             )
             
         config.set_mode(mode)
+        # Rendered pages are kept per mode; only re-read the ones edited on disk
+        await _drop_stale_static_pages()
+        _clear_detection_cache()
         return HTMLResponse(
             content=f"""
             <html>
@@ -443,14 +870,423 @@ async def set_mode(mode: str):
             status_code=500
         )
 
-# Multiple formats of the same endpoint to handle various deployment scenarios
-@app.post("/api/check-product-tables")
-@app.post("/api/check_product_tables") 
-@app.post("/check_product_tables")  # Add non-API prefixed version 
-@app.post("/check-product-tables")  # Additional non-API endpoint for compatibility
-@app.post("/product-tables-check")  # Extra route to catch more variations
-@app.get("/api/check_simple") # Simple GET endpoint for testing connectivity
-@app.get("/api/check-product-tables/simple") # Additional test endpoint for production
+# Hosts (as normalised by _url_host) that reported bot protection, mapped to when it was last seen (time.monotonic())
+_BOT_BLOCKED_TTL = 3600
+_bot_blocked_hosts: Dict[str, float] = {}
+_bot_blocked_lock = threading.Lock()
+
+def _host_recently_blocked(url):
+    """Return True if the URL's host reported bot protection within the last hour."""
+    host = _url_host(url)
+    with _bot_blocked_lock:
+        blocked_at = _bot_blocked_hosts.get(host)
+        if blocked_at is None:
+            return False
+        if time.monotonic() - blocked_at >= _BOT_BLOCKED_TTL:
+            del _bot_blocked_hosts[host]
+            return False
+        return True
+
+def _remember_bot_blocked(url, result):
+    """Record the URL's host when a real (non-simulated) check reports bot protection."""
+    if result.get('bot_blocked', False):
+        with _bot_blocked_lock:
+            _bot_blocked_hosts[_url_host(url)] = time.monotonic()
+
+# Result templates for test domains in development mode; copied before being returned
+_SIMULATED_FOUND_RESULT = {
+    'found': True, 
+    'class_name': 'product-table productListContainer',
+    'detection_method': 'simulated',
+    'is_test_domain': True,
+    'bot_blocked': False
+}
+_SIMULATED_BOT_BLOCKED_RESULT = {
+    'found': False,
+    'error': 'Simulated bot protection (development mode)',
+    'detection_method': 'simulated',
+    'is_test_domain': True,
+    'bot_blocked': True
+}
+
+def _simulate_found(url, timeout, mode):
+    """Simulated success for a test domain in development mode."""
+    logger.debug("Using simulated success response for test domain in development mode: %s", url)
+    return dict(_SIMULATED_FOUND_RESULT)
+
+def _simulate_bot_blocked(url, timeout, mode):
+    """Simulated bot protection for a test domain in development mode."""
+    logger.debug("Using simulated BOT BLOCKED response for test domain in development mode: %s", url)
+    return dict(_SIMULATED_BOT_BLOCKED_RESULT)
+
+# Last installed-browser probe result and when it was taken (time.monotonic)
+_BROWSERS_AVAILABLE_CACHE = {"value": False, "checked_at": None}
+_BROWSERS_AVAILABLE_TTL = 30.0
+
+def _browsers_available():
+    """Whether real browsers (not just the Selenium library) are installed, re-probed at most every 30s."""
+    now = time.monotonic()
+    checked_at = _BROWSERS_AVAILABLE_CACHE["checked_at"]
+    if checked_at is not None and now - checked_at < _BROWSERS_AVAILABLE_TTL:
+        return _BROWSERS_AVAILABLE_CACHE["value"]
+    
+    value = False
+    try:
+        # Check if browsers are actually installed (not just the automation library)
+        if BROWSER_AUTOMATION_AVAILABLE and check_browser_availability is not None:
+            value = check_browser_availability()
+    except Exception as browser_check_error:
+        logger.warning("Could not verify browser availability: %s", browser_check_error)
+    
+    _BROWSERS_AVAILABLE_CACHE["value"] = value
+    _BROWSERS_AVAILABLE_CACHE["checked_at"] = now
+    return value
+
+def _showcase_check(url, timeout, mode):
+    """
+    Real detection for partly-products-showcase.lovable.app outside development mode.
+    HTTP first, then browser automation, text analysis and cloud detection as available.
+    Text analysis always runs, so it is started up front and overlaps the HTTP/browser checks.
+    """
+    logger.debug("[PRODUCTION DOMAIN] Using REAL detection for partly-products-showcase domain: %s", url)
+    # Add extra debug logging for production troubleshooting
+    logger.debug("[PRODUCTION DOMAIN] Processing URL: %s with REAL detection (mode: %s, is_test_domain: False)", url, mode)
+    
+    text_future = None
+    if TEXT_ANALYSIS_AVAILABLE:
+        logger.debug("Using text-based detection for %s", url)
+        text_future = _TEXT_ANALYSIS_POOL.submit(check_for_product_tables_with_text_analysis, url)
+    
+    # Check if browser automation is actually available with real browsers
+    browsers_actually_available = _browsers_available()
+    logger.debug("Browser availability check result: %s", browsers_actually_available)
+    
+    # Use HTTP detection first - treating this as a REAL production domain
+    logger.debug("Using HTTP detection method for %s in production", url)
+    http_result = email_qa_enhanced.check_for_product_tables(url, timeout=timeout)
+    # Use browser_unavailable for detection_method to ensure consistent reporting
+    http_result['detection_method'] = 'browser_unavailable'
+    http_result['is_test_domain'] = False  # Explicitly mark as NOT a test domain
+    
+    # Use standardized message if browser automation is unavailable
+    if http_result.get('found') is None or http_result.get('message', '').startswith('Browser automation unavailable'):
+        http_result['message'] = 'Unknown - Browser automation unavailable - manual verification required'
+    
+    # If product tables are found, use that result
+    if http_result.get('found', False):
+        logger.debug("HTTP method found product tables for %s in production mode", url)
+        result = http_result
+    else:
+        # Even if bot blocking detected, don't simulate - handle it like any other site
+        # This ensures it behaves like a real production site
+        result = http_result
+        
+    # Try browser automation as a fallback if needed
+    # We already verified browser availability above
+    if not result.get('found', False) and BROWSER_AUTOMATION_AVAILABLE:
+        logger.debug("HTTP method did not find product tables, trying browser automation for %s", url)
+        try:
+            browser_result = browser_check(url, timeout=timeout)
+            browser_result['detection_method'] = 'browser_production'
+            browser_result['is_test_domain'] = False  # Explicitly mark as NOT a test domain
+            
+            # If browser found something, use that result
+            if browser_result.get('found', False):
+                logger.debug("Browser automation found product tables for %s in production", url)
+                result = browser_result
+        except Exception as e:
+            logger.warning("Browser automation failed in production mode for %s: %s", url, e)
+        
+    # Try text analysis for all URLs where browser automation isn't available
+    # This is more proactive - we use text analysis not just as a last resort
+    if text_future is not None:
+        try:
+            text_result = text_future.result()
+            text_result['detection_method'] = 'browser_unavailable'
+            text_result['is_test_domain'] = False  # Explicitly mark as NOT a test domain
+            
+            # If text analysis gives a confident result, use it
+            if text_result.get('found', True) and text_result.get('confidence') in ['high', 'medium']:
+                logger.debug("Text analysis found product content with %s confidence for %s", text_result.get('confidence'), url)
+                result = text_result
+            # FIXED: For URLs in the /products/ path, we now use actual cloud detection results
+            # instead of always returning Unknown status
+            elif _PRODUCT_PATH_RE.search(url):
+                logger.debug("IMPROVED: URL %s contains product path - using cloud detection results", url)
+                
+                # Use cloud browser API if available (check for API key directly)
+                if os.environ.get('SCRAPINGBEE_API_KEY') and check_for_product_tables_cloud is not None:
+                    try:
+                        cloud_result = check_for_product_tables_cloud(url, timeout=20)
+                        # Use the cloud detection result directly
+                        result = cloud_result
+                        logger.debug("Cloud detection found: %s for %s", cloud_result.get('found'), url)
+                    except Exception as e:
+                        logger.error("Error with cloud detection for %s: %s", url, e)
+                        # Only use fallback if cloud detection fails
+                        result = {
+                            'found': None,
+                            'class_name': None,
+                            'detection_method': 'cloud_error',
+                            'message': f'Cloud detection error: {str(e)}',
+                            'is_test_domain': False
+                        }
+                else:
+                    # Only if cloud browser is not available
+                    result = {
+                        'found': None,
+                        'class_name': None,
+                        'detection_method': 'browser_unavailable',
+                        'message': 'Unknown - Browser automation unavailable - manual verification required',
+                        'is_test_domain': False
+                    }
+            # Otherwise, keep the current result
+        except Exception as text_error:
+            logger.warning("Text analysis failed for %s: %s", url, text_error)
+    
+    return result
+
+def _browser_first_check(url, timeout):
+    """Hybrid check: browser automation first, falling back to HTTP."""
+    # Try browser automation first
+    logger.debug("Attempting browser-based check for %s", url)
+    try:
+        result = browser_check(url, timeout=timeout)
+        logger.debug("Browser check completed for %s with result: %s", url, result)
+        
+        # If browser check fails but it's not a timeout (which is a real result),
+        # we should try the HTTP method as fallback
+        error_msg = result.get('error', '')
+        if (not result.get('found', False) and 
+            error_msg and 
+            not (isinstance(error_msg, str) and 'timeout' in error_msg.lower())):
+            logger.debug("Browser check didn't find product tables for %s, trying HTTP fallback", url)
+            http_result = email_qa_enhanced.check_for_product_tables(url, timeout=timeout)
+            
+            # If HTTP method finds something or gives more specific details, use that result
+            if http_result.get('found', False):
+                logger.debug("HTTP fallback found product tables for %s", url)
+                http_result['detection_method'] = 'http_fallback_after_selenium'
+                result = http_result
+    except Exception as browser_error:
+        # Handle exceptions during browser automation
+        logger.warning("Browser automation error for %s: %s", url, browser_error)
+        logger.debug("Using HTTP fallback due to browser automation error")
+        result = email_qa_enhanced.check_for_product_tables(url, timeout=timeout)
+        result['detection_method'] = 'http_fallback_after_error'
+        
+        # Make sure bot_blocked flag is preserved (very important!)
+        if result.get('bot_blocked', False):
+            logger.warning("Bot blocking detected for %s during fallback - will report this in the response", url)
+    
+    return result
+
+def _direct_http_check(url, timeout):
+    """HTTP-only check used when browser automation is not available."""
+    logger.debug("Browser automation not available, using direct HTTP check for %s", url)
+    result = email_qa_enhanced.check_for_product_tables(url, timeout=timeout)
+    
+    # Add additional context to the result to show we used direct HTTP
+    if 'detection_method' not in result:
+        result['detection_method'] = 'direct_http'
+        
+    # Make sure bot_blocked flag is preserved (very important!)
+    if result.get('bot_blocked', False):
+        logger.warning("Bot blocking detected for %s - will report this in the response", url)
+    
+    return result
+
+# Generic URL strategy keyed by BROWSER_AUTOMATION_AVAILABLE
+_HYBRID_CHECKS = {True: _browser_first_check, False: _direct_http_check}
+
+def _showcase_real_check(url, timeout, mode):
+    """Real detection for partly-products-showcase.lovable.app outside development mode."""
+    result = _showcase_check(url, timeout, mode)
+    _remember_bot_blocked(url, result)
+    return result
+
+def _generic_check(url, timeout, mode):
+    """Hybrid browser/HTTP detection for any other URL."""
+    # Hosts that recently blocked automation go straight to HTTP instead of launching a browser
+    if _host_recently_blocked(url):
+        logger.debug("Host for %s recently blocked automated access, skipping browser check", url)
+        result = _direct_http_check(url, timeout)
+    else:
+        # Use hybrid approach for better detection - try browser automation first with fallback to HTTP
+        result = _HYBRID_CHECKS[BROWSER_AUTOMATION_AVAILABLE](url, timeout)
+    _remember_bot_blocked(url, result)
+    return result
+
+# One handler per URL kind, each called as handler(url, timeout, mode)
+_URL_HANDLERS = {
+    UrlKind.DEV_TEST_SIM: _simulate_found,
+    UrlKind.DEV_TEST_BOT_SIM: _simulate_bot_blocked,
+    UrlKind.PROD_PARTLY: _showcase_real_check,
+    UrlKind.GENERIC: _generic_check,
+}
+# Kinds answered without network or browser work, cheap enough to run on the event loop
+_SIMULATED_KINDS = frozenset((UrlKind.DEV_TEST_SIM, UrlKind.DEV_TEST_BOT_SIM))
+
+# Shared shape of failed detection results; copied and filled in by _error_result
+_ERROR_TEMPLATE = {'found': False, 'error': None, 'detection_method': 'error'}
+
+def _error_result(error, detection_method='error', bot_blocked=None):
+    """Build a failed detection result; bot_blocked is only included when it is known."""
+    result = _ERROR_TEMPLATE.copy()
+    result['error'] = error
+    result['detection_method'] = detection_method
+    if bot_blocked is not None:
+        result['bot_blocked'] = bot_blocked
+    return result
+
+def _check_one(url, timeout, mode):
+    """
+    Run product table detection for a single URL.
+    Blocking (HTTP, Selenium, text analysis); called from a worker thread by check_product_tables.
+    
+    Returns:
+        tuple: (url, detection result dict)
+    """
+    try:
+        result = _URL_HANDLERS[_url_kind(url, mode)](url, timeout, mode)
+    except Exception as url_error:
+        # Handle errors for individual URLs separately
+        logger.error("Error checking product table for URL %s: %s", url, url_error)
+        
+        error_text = str(url_error)
+        result = _error_result(f"Error processing URL: {error_text}")
+        
+        # For Cloudflare domains or other known bot protection, add bot_blocked flag
+        if 'cloudflare' in url.lower() or _ERROR_BOT_RE.search(error_text):
+            logger.warning("Likely bot protection detected from error handling for %s", url)
+            result['bot_blocked'] = True
+    
+    logger.info("Product table check url=%s mode=%s method=%s found=%s bot_blocked=%s",
+                url, mode, result.get('detection_method'), result.get('found'), result.get('bot_blocked', False))
+    return url, result
+
+# Recent product table results keyed by (url, mode, timeout); failed and timed-out checks are not cached
+_DETECTION_CACHE_TTL = 300
+_DETECTION_CACHE_MAXSIZE = 2048
+_DETECTION_CACHE: "OrderedDict[tuple, tuple]" = OrderedDict()
+_DETECTION_CACHE_LOCK = threading.Lock()
+_DETECTION_INFLIGHT: Dict[tuple, threading.Lock] = {}
+
+def _cache_get(key):
+    """Return a cached detection result for key, or None if missing or expired."""
+    with _DETECTION_CACHE_LOCK:
+        entry = _DETECTION_CACHE.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if expires_at < time.monotonic():
+            del _DETECTION_CACHE[key]
+            return None
+        _DETECTION_CACHE.move_to_end(key)
+        return dict(result)
+
+def _clear_detection_cache():
+    """Drop all cached product table results (e.g. after a mode switch)."""
+    with _DETECTION_CACHE_LOCK:
+        _DETECTION_CACHE.clear()
+
+def _is_cacheable(result):
+    """Errors and timeouts are transient, so they are re-checked on the next request."""
+    if result.get('detection_method') == 'error':
+        return False
+    error = result.get('error')
+    return not (isinstance(error, str) and 'timeout' in error.lower())
+
+def _url_deadline(timeout):
+    """Seconds a single URL check may take before it is abandoned."""
+    return (timeout or getattr(config, 'product_table_timeout', 30)) + _URL_DEADLINE_GRACE
+
+def _deadline_result(deadline):
+    """Uncached result for a URL check abandoned after its hard deadline."""
+    return _error_result(f"Hard timeout after {deadline} seconds", 'timeout', False)
+
+def _cached_check_one(url, timeout, mode, deadline=None):
+    """
+    Cached wrapper around _check_one.
+    Concurrent checks of the same URL wait for the first one instead of repeating it,
+    but only until the deadline, so a hung check cannot park a pool thread per retry.
+    """
+    key = (url, mode, timeout)
+    cached = _cache_get(key)
+    if cached is not None:
+        return url, cached
+    
+    if deadline is None:
+        deadline = _url_deadline(timeout)
+    
+    with _DETECTION_CACHE_LOCK:
+        inflight = _DETECTION_INFLIGHT.setdefault(key, threading.Lock())
+    
+    if not inflight.acquire(timeout=deadline):
+        logger.warning("Gave up waiting %s seconds for the in-flight product table check of %s", deadline, url)
+        return url, _deadline_result(deadline)
+    
+    try:
+        cached = _cache_get(key)
+        if cached is not None:
+            return url, cached
+        
+        try:
+            url, result = _check_one(url, timeout, mode)
+            if _is_cacheable(result):
+                with _DETECTION_CACHE_LOCK:
+                    _DETECTION_CACHE[key] = (time.monotonic() + _DETECTION_CACHE_TTL, dict(result))
+                    _DETECTION_CACHE.move_to_end(key)
+                    while len(_DETECTION_CACHE) > _DETECTION_CACHE_MAXSIZE:
+                        _DETECTION_CACHE.popitem(last=False)
+        finally:
+            with _DETECTION_CACHE_LOCK:
+                _DETECTION_INFLIGHT.pop(key, None)
+    finally:
+        inflight.release()
+    
+    return url, result
+
+def _make_url_checker(timeout):
+    """
+    Build the per-request coroutine that checks one URL and returns (url, result).
+    Each check blocks on network or browser I/O, so it runs on the detection pool instead of the event loop.
+    """
+    loop = asyncio.get_running_loop()
+    mode = config.mode
+    semaphore = asyncio.Semaphore(_DETECTION_CONCURRENCY)
+    # Hard per-URL deadline so a stuck browser cannot hold the response past the requested timeout
+    deadline = _url_deadline(timeout)
+    
+    async def check_bounded(url):
+        # Simulated test-domain results need no worker thread, cache entry or semaphore slot
+        kind = _url_kind(url, mode)
+        if kind in _SIMULATED_KINDS:
+            return url, _URL_HANDLERS[kind](url, timeout, mode)
+        
+        # Limit how many checks from one request run at once to avoid browser driver thrash
+        async with semaphore:
+            try:
+                return await asyncio.wait_for(
+                    loop.run_in_executor(_DETECTION_POOL, _cached_check_one, url, timeout, mode, deadline),
+                    timeout=deadline
+                )
+            except asyncio.TimeoutError:
+                # The worker thread finishes in the background; this URL just stops waiting for it
+                logger.warning("Product table check for %s exceeded %s seconds", url, deadline)
+                return url, _deadline_result(deadline)
+    
+    return check_bounded
+
+# Multiple formats of the same endpoint to handle various deployment scenarios;
+# only the canonical path is published in the OpenAPI schema
+@app.post("/api/check-product-tables", dependencies=_REJECT_BOTS, response_model=CheckProductTablesResponse)
+@app.post("/api/check_product_tables", dependencies=_REJECT_BOTS, include_in_schema=False) 
+@app.post("/check_product_tables", dependencies=_REJECT_BOTS, include_in_schema=False)  # Add non-API prefixed version 
+@app.post("/check-product-tables", dependencies=_REJECT_BOTS, include_in_schema=False)  # Additional non-API endpoint for compatibility
+@app.post("/product-tables-check", dependencies=_REJECT_BOTS, include_in_schema=False)  # Extra route to catch more variations
+@app.get("/api/check_simple", dependencies=_REJECT_BOTS, include_in_schema=False) # Simple GET endpoint for testing connectivity
+@app.get("/api/check-product-tables/simple", dependencies=_REJECT_BOTS, include_in_schema=False) # Additional test endpoint for production
 async def check_product_tables(
     urls: list = Body(..., description="List of URLs to check for product tables"),
     timeout: Optional[int] = Body(None, description="Timeout for product table checks in seconds")
@@ -469,229 +1305,33 @@ async def check_product_tables(
     """
     try:
         if not urls:
-            return JSONResponse(
+            return FastJSONResponse(
                 status_code=400,
                 content={"error": "No URLs provided"}
             )
-            
+        
+        _load_browser_automation()
+        _load_text_analysis()
+        check_bounded = _make_url_checker(timeout)
+        
+        # Duplicate URLs share one check; results are keyed by URL, so the response shape is unchanged
+        unique_urls = list(dict.fromkeys(urls))
+        outcomes = await asyncio.gather(*[check_bounded(url) for url in unique_urls], return_exceptions=True)
+        
         results = {}
-        for url in urls:
-            try:
-                # Log the URL we're checking
-                logger.info(f"Processing product table check for URL: {url}")
-                
-                # Handle test domains differently depending on mode
-                # In production, partly-products-showcase.lovable.app should NOT be considered a test domain
-                if config.mode == 'production':
-                    is_test_domain = ('localhost:5001' in url or '127.0.0.1:5001' in url)
-                else:
-                    # In development mode, also treat partly-products-showcase.lovable.app as a test domain
-                    is_test_domain = ('partly-products-showcase.lovable.app' in url or 
-                                    'localhost:5001' in url or 
-                                    '127.0.0.1:5001' in url)
-                
-                # In development mode, use simulated results for test domains
-                if (config.mode == 'development' and is_test_domain):
-                    # Check if we should simulate bot protection instead
-                    if 'simulate=bot_blocked' in url or 'bot_blocked=true' in url:
-                        logger.info(f"Using simulated BOT BLOCKED response for test domain in development mode: {url}")
-                        results[url] = {
-                            'found': False,
-                            'error': 'Simulated bot protection (development mode)',
-                            'detection_method': 'simulated',
-                            'is_test_domain': True,
-                            'bot_blocked': True
-                        }
-                    else:
-                        # Standard simulated success
-                        logger.info(f"Using simulated success response for test domain in development mode: {url}")
-                        # For test domains in development mode, return a simulated positive result
-                        results[url] = {
-                            'found': True, 
-                            'class_name': 'product-table productListContainer',
-                            'detection_method': 'simulated',
-                            'is_test_domain': True,
-                            'bot_blocked': False
-                        }
-                # In production mode for partly-products-showcase.lovable.app, use REAL detection
-                elif ('partly-products-showcase.lovable.app' in url):
-                    logger.info(f"[PRODUCTION DOMAIN] Using REAL detection for partly-products-showcase domain: {url}")
-                    # Add extra debug logging for production troubleshooting
-                    print(f"[PRODUCTION DOMAIN] Processing URL: {url} with REAL detection")
-                    print(f"[PRODUCTION DOMAIN] Current mode: {config.mode}")
-                    # Output is_test_domain value for debugging
-                    is_test_domain = False
-                    print(f"[PRODUCTION DOMAIN] is_test_domain set to: {is_test_domain}")
-                    
-                    # Check if browser automation is actually available with real browsers
-                    browsers_actually_available = False
-                    try:
-                        # Check if browsers are actually installed (not just the automation library)
-                        if BROWSER_AUTOMATION_AVAILABLE:
-                            from selenium_automation import check_browser_availability
-                            browsers_actually_available = check_browser_availability()
-                            logger.info(f"Browser availability check result: {browsers_actually_available}")
-                    except Exception as browser_check_error:
-                        logger.warning(f"Could not verify browser availability: {str(browser_check_error)}")
-                        browsers_actually_available = False
-                    
-                    # Use HTTP detection first - treating this as a REAL production domain
-                    logger.info(f"Using HTTP detection method for {url} in production")
-                    http_result = email_qa_enhanced.check_for_product_tables(url, timeout=timeout)
-                    # Use browser_unavailable for detection_method to ensure consistent reporting
-                    http_result['detection_method'] = 'browser_unavailable'
-                    http_result['is_test_domain'] = False  # Explicitly mark as NOT a test domain
-                    
-                    # Use standardized message if browser automation is unavailable
-                    if http_result.get('found') is None or http_result.get('message', '').startswith('Browser automation unavailable'):
-                        http_result['message'] = 'Unknown - Browser automation unavailable - manual verification required'
-                    
-                    # If product tables are found, use that result
-                    if http_result.get('found', False):
-                        logger.info(f"HTTP method found product tables for {url} in production mode")
-                        results[url] = http_result
-                    else:
-                        # Even if bot blocking detected, don't simulate - handle it like any other site
-                        # This ensures it behaves like a real production site
-                        results[url] = http_result
-                        
-                    # Try browser automation as a fallback if needed
-                    # We already verified browser availability above
-                    if not results[url].get('found', False) and BROWSER_AUTOMATION_AVAILABLE:
-                        logger.info(f"HTTP method did not find product tables, trying browser automation for {url}")
-                        try:
-                            browser_result = browser_check(url, timeout=timeout)
-                            browser_result['detection_method'] = 'browser_production'
-                            browser_result['is_test_domain'] = False  # Explicitly mark as NOT a test domain
-                            
-                            # If browser found something, use that result
-                            if browser_result.get('found', False):
-                                logger.info(f"Browser automation found product tables for {url} in production")
-                                results[url] = browser_result
-                        except Exception as e:
-                            logger.warning(f"Browser automation failed in production mode for {url}: {str(e)}")
-                        
-                    # Try text analysis for all URLs where browser automation isn't available
-                    # This is more proactive - we use text analysis not just as a last resort
-                    if TEXT_ANALYSIS_AVAILABLE:
-                        try:
-                            logger.info(f"Using text-based detection for {url}")
-                            text_result = check_for_product_tables_with_text_analysis(url)
-                            text_result['detection_method'] = 'browser_unavailable'
-                            text_result['is_test_domain'] = False  # Explicitly mark as NOT a test domain
-                            
-                            # If text analysis gives a confident result, use it
-                            if text_result.get('found', True) and text_result.get('confidence') in ['high', 'medium']:
-                                logger.info(f"Text analysis found product content with {text_result.get('confidence')} confidence for {url}")
-                                results[url] = text_result
-                            # FIXED: For URLs in the /products/ path, we now use actual cloud detection results
-                            # instead of always returning Unknown status
-                            elif '/products/' in url or '/product/' in url or url.endswith('/products'):
-                                logger.info(f"IMPROVED: URL {url} contains product path - using cloud detection results")
-                                
-                                # Use cloud browser API if available (check for API key directly)
-                                if os.environ.get('SCRAPINGBEE_API_KEY'):
-                                    try:
-                                        from cloud_browser_automation import check_for_product_tables_cloud
-                                        cloud_result = check_for_product_tables_cloud(url, timeout=20)
-                                        # Use the cloud detection result directly
-                                        results[url] = cloud_result
-                                        logger.info(f"Cloud detection found: {cloud_result.get('found')} for {url}")
-                                    except Exception as e:
-                                        logger.error(f"Error with cloud detection for {url}: {str(e)}")
-                                        # Only use fallback if cloud detection fails
-                                        results[url] = {
-                                            'found': None,
-                                            'class_name': None,
-                                            'detection_method': 'cloud_error',
-                                            'message': f'Cloud detection error: {str(e)}',
-                                            'is_test_domain': False
-                                        }
-                                else:
-                                    # Only if cloud browser is not available
-                                    results[url] = {
-                                        'found': None,
-                                        'class_name': None,
-                                        'detection_method': 'browser_unavailable',
-                                        'message': 'Unknown - Browser automation unavailable - manual verification required',
-                                        'is_test_domain': False
-                                    }
-                            # Otherwise, keep the current result
-                        except Exception as text_error:
-                            logger.warning(f"Text analysis failed for {url}: {str(text_error)}")
-                else:
-                    # Use hybrid approach for better detection - try browser automation first with fallback to HTTP
-                    if BROWSER_AUTOMATION_AVAILABLE:
-                        # Try browser automation first
-                        logger.info(f"Attempting browser-based check for {url}")
-                        try:
-                            result = browser_check(url, timeout=timeout)
-                            logger.info(f"Browser check completed for {url} with result: {result}")
-                            
-                            # If browser check fails but it's not a timeout (which is a real result),
-                            # we should try the HTTP method as fallback
-                            error_msg = result.get('error', '')
-                            if (not result.get('found', False) and 
-                                error_msg and 
-                                not (isinstance(error_msg, str) and 'timeout' in error_msg.lower())):
-                                logger.info(f"Browser check didn't find product tables for {url}, trying HTTP fallback")
-                                http_result = email_qa_enhanced.check_for_product_tables(url, timeout=timeout)
-                                
-                                # If HTTP method finds something or gives more specific details, use that result
-                                if http_result.get('found', False):
-                                    logger.info(f"HTTP fallback found product tables for {url}")
-                                    http_result['detection_method'] = 'http_fallback_after_selenium'
-                                    result = http_result
-                        except Exception as browser_error:
-                            # Handle exceptions during browser automation
-                            logger.warning(f"Browser automation error for {url}: {str(browser_error)}")
-                            logger.info(f"Using HTTP fallback due to browser automation error")
-                            result = email_qa_enhanced.check_for_product_tables(url, timeout=timeout)
-                            result['detection_method'] = 'http_fallback_after_error'
-                            
-                            # Make sure bot_blocked flag is preserved (very important!)
-                            if result.get('bot_blocked', False):
-                                logger.warning(f"Bot blocking detected for {url} during fallback - will report this in the response")
-                    else:
-                        # Browser automation is not available, use direct HTTP check
-                        logger.info(f"Browser automation not available, using direct HTTP check for {url}")
-                        result = email_qa_enhanced.check_for_product_tables(url, timeout=timeout)
-                        
-                        # Add additional context to the result to show we used direct HTTP
-                        if 'detection_method' not in result:
-                            result['detection_method'] = 'direct_http'
-                            
-                        # Make sure bot_blocked flag is preserved (very important!)
-                        if result.get('bot_blocked', False):
-                            logger.warning(f"Bot blocking detected for {url} - will report this in the response")
-                    
-                    logger.info(f"Product table check result for {url}: {result}")
-                    results[url] = result
-            except Exception as url_error:
-                # Handle errors for individual URLs separately
-                logger.error(f"Error checking product table for URL {url}: {str(url_error)}")
-                
-                # For Cloudflare domains or other known bot protection, add bot_blocked flag
-                if 'cloudflare' in url.lower() or 'captcha' in str(url_error).lower() or 'bot' in str(url_error).lower():
-                    logger.warning(f"Likely bot protection detected from error handling for {url}")
-                    results[url] = {
-                        'found': False,
-                        'error': f"Error processing URL: {str(url_error)}",
-                        'detection_method': 'error',
-                        'bot_blocked': True
-                    }
-                else:
-                    results[url] = {
-                        'found': False,
-                        'error': f"Error processing URL: {str(url_error)}",
-                        'detection_method': 'error'
-                    }
+        for url, outcome in zip(unique_urls, outcomes):
+            if isinstance(outcome, BaseException):
+                # One failed URL must not discard the results of the others
+                logger.error("Error checking product table for URL %s: %s", url, outcome)
+                results[url] = _error_result(f"Error processing URL: {str(outcome)}")
+            else:
+                results[url] = outcome[1]
             
-        return JSONResponse(content={"results": results})
+        return FastJSONResponse(content={"results": results})
         
     except Exception as e:
-        logger.error(f"Error checking product tables: {e}")
-        return JSONResponse(
+        logger.error("Error checking product tables: %s", e)
+        return FastJSONResponse(
             status_code=500,
             content={"results": {
                 "error": f"Failed to check product tables: {str(e)}",
@@ -700,8 +1340,207 @@ async def check_product_tables(
             }}
         )
 
+@app.post("/api/check-product-tables/stream", dependencies=_REJECT_BOTS)
+async def check_product_tables_stream(
+    urls: list = Body(..., description="List of URLs to check for product tables"),
+    timeout: Optional[int] = Body(None, description="Timeout for product table checks in seconds")
+):
+    """
+    Check URLs like /api/check-product-tables, but stream the results as newline-delimited JSON.
+    Each line is {"url": ..., "result": ...} and is sent as soon as that URL's check completes,
+    so clients can show fast results without waiting for the slowest page.
+    """
+    if not urls:
+        return FastJSONResponse(
+            status_code=400,
+            content={"error": "No URLs provided"}
+        )
+    
+    _load_browser_automation()
+    _load_text_analysis()
+    check_bounded = _make_url_checker(timeout)
+    
+    async def check_safely(url):
+        try:
+            return await check_bounded(url)
+        except Exception as e:
+            # One failed URL must not end the stream for the others
+            logger.error("Error checking product table for URL %s: %s", url, e)
+            return url, _error_result(f"Error processing URL: {str(e)}")
+    
+    async def result_lines():
+        tasks = [asyncio.ensure_future(check_safely(url)) for url in dict.fromkeys(urls)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                url, result = await next_done
+                yield _encode_json({"url": url, "result": result}) + b"\n"
+        finally:
+            # Stop waiting on remaining checks if the client disconnects
+            for task in tasks:
+                task.cancel()
+    
+    return StreamingResponse(result_lines(), media_type="application/x-ndjson")
+
+def _error_indicates_bot(error_message, source):
+    """Check an error message for bot protection indicators (_BOT_RE ignores case)."""
+    bot_detected = bool(_BOT_RE.search(error_message))
+    if bot_detected:
+        logger.warning("Possible bot protection detected in %s: %s", source, error_message)
+    return bot_detected
+
+def _detection_error_result(outcome, error_prefix, detection_method, source):
+    """Turn an exception returned by asyncio.gather into the comparison error dict."""
+    if not isinstance(outcome, BaseException):
+        return outcome
+    
+    error_message = str(outcome)
+    bot_detected = _error_indicates_bot(error_message, source)
+    return _error_result(f"{error_prefix}: {error_message}", detection_method, bot_detected)
+
+async def _compare_one(url, timeout, mode):
+    """
+    Compare HTTP, browser and text analysis detection for a single URL.
+    The independent checks run concurrently on the detection pool.
+    
+    Returns:
+        tuple: (url, comparison result dict)
+    """
+    try:
+        # Log the URL we're checking
+        logger.info("Comparing detection methods for URL: %s", url)
+        
+        # Handle test domains differently depending on mode
+        # In production, partly-products-showcase.lovable.app should NOT be considered a test domain
+        is_test_domain, _ = _classify_url(url, mode)
+        
+        if (mode == 'development' and is_test_domain):
+            
+            # Always a positive, non-blocked result for simulated test domains
+            simulated_result = dict(_SIMULATED_FOUND_RESULT)
+            
+            result = {
+                'http': simulated_result,
+                'browser': simulated_result,
+                'is_test_domain': True
+            }
+        
+        else:
+            # The HTTP, browser and text checks are independent, so run them concurrently
+            loop = asyncio.get_running_loop()
+            skip_browser = BROWSER_AUTOMATION_AVAILABLE and _host_recently_blocked(url)
+            
+            http_task = loop.run_in_executor(
+                _DETECTION_POOL, functools.partial(email_qa_enhanced.check_for_product_tables, url, timeout=timeout)
+            )
+            browser_task = None
+            if BROWSER_AUTOMATION_AVAILABLE and not skip_browser:
+                browser_task = loop.run_in_executor(
+                    _DETECTION_POOL, functools.partial(browser_check, url, timeout=timeout)
+                )
+            text_task = None
+            if TEXT_ANALYSIS_AVAILABLE:
+                text_task = loop.run_in_executor(_DETECTION_POOL, check_for_product_tables_with_text_analysis, url)
+            
+            pending = [task for task in (http_task, browser_task, text_task) if task is not None]
+            outcomes = iter(await asyncio.gather(*pending, return_exceptions=True))
+            http_result = next(outcomes)
+            browser_result = next(outcomes) if browser_task is not None else None
+            text_result = next(outcomes) if text_task is not None else None
+            
+            # An HTTP failure fails the whole URL, as before
+            if isinstance(http_result, BaseException):
+                raise http_result
+            _remember_bot_blocked(url, http_result)
+            
+            # Browser result, unless the host is known to block automation
+            if skip_browser:
+                browser_result = {
+                    'found': False,
+                    'error': "Browser check skipped - host recently blocked automated access",
+                    'detection_method': 'skipped_bot_blocked',
+                    'bot_blocked': True
+                }
+            elif browser_task is not None:
+                browser_result = _detection_error_result(
+                    browser_result, "Browser automation error", 'browser_error', "browser error"
+                )
+                _remember_bot_blocked(url, browser_result)
+            else:
+                browser_result = {
+                    'found': False,
+                    'error': "Browser automation not available",
+                    'detection_method': 'unavailable',
+                    'bot_blocked': False  # No bot blocking since browser automation isn't even attempted
+                }
+            
+            # If text analysis is available, include it in the comparison
+            if TEXT_ANALYSIS_AVAILABLE:
+                text_result = _detection_error_result(
+                    text_result, "Text analysis error", 'text_analysis_error', "text analysis error"
+                )
+                
+                # Add text analysis result to the comparison
+                comparison_result = {
+                    'http': http_result,
+                    'browser': browser_result,
+                    'text_analysis': text_result,
+                    'agreement': {
+                        'http_browser': http_result.get('found') == browser_result.get('found'),
+                        'http_text': http_result.get('found') == text_result.get('found'),
+                        'browser_text': browser_result.get('found') == text_result.get('found'),
+                        'all_agree': (http_result.get('found') == browser_result.get('found') == text_result.get('found'))
+                    }
+                }
+                
+                # Determine recommended method based on majority vote
+                detection_count = sum([
+                    1 if http_result.get('found') else 0,
+                    1 if browser_result.get('found') else 0,
+                    1 if text_result.get('found') else 0
+                ])
+                
+                if detection_count >= 2:
+                    # At least 2 methods found a product table - positive result
+                    comparison_result['recommended'] = 'majority_vote_positive'
+                elif detection_count == 0:
+                    # No method found a product table - negative result
+                    comparison_result['recommended'] = 'majority_vote_negative'
+                else:
+                    # Only one method found a product table - use the most reliable method
+                    if browser_result.get('found'):
+                        comparison_result['recommended'] = 'browser_only'
+                    elif http_result.get('found'):
+                        comparison_result['recommended'] = 'http_only'
+                    elif text_result.get('found'):
+                        comparison_result['recommended'] = 'text_analysis_only'
+                    else:
+                        comparison_result['recommended'] = None
+            else:
+                # Just HTTP and browser comparison if text analysis isn't available
+                comparison_result = {
+                    'http': http_result,
+                    'browser': browser_result,
+                    'agreement': http_result.get('found') == browser_result.get('found'),
+                    'recommended': 'browser' if browser_result.get('found') else ('http' if http_result.get('found') else None)
+                }
+            
+            result = comparison_result
+    
+    except Exception as url_error:
+        logger.error("Error comparing methods for URL %s: %s", url, url_error)
+        error_message = str(url_error)
+        bot_detected = _error_indicates_bot(error_message, "URL error")
+        
+        result = {
+            'error': f"Error processing URL: {error_message}",
+            'success': False,
+            'bot_blocked': bot_detected
+        }
+    
+    return url, result
+
 # Add a new endpoint to compare HTTP vs browser checking methods
-@app.post("/api/compare_detection_methods")
+@app.post("/api/compare_detection_methods", dependencies=_REJECT_BOTS)
 async def compare_detection_methods(
     urls: list = Body(..., description="List of URLs to check using both methods"),
     timeout: Optional[int] = Body(None, description="Timeout for checks in seconds")
@@ -719,174 +1558,35 @@ async def compare_detection_methods(
     """
     try:
         if not urls:
-            return JSONResponse(
+            return FastJSONResponse(
                 status_code=400,
                 content={"error": "No URLs provided"}
             )
+        
+        _load_browser_automation()
+        _load_text_analysis()
             
-        results = {}
-        for url in urls:
-            try:
-                # Log the URL we're checking
-                logger.info(f"Comparing detection methods for URL: {url}")
-                
-                # Handle test domains differently depending on mode
-                # In production, partly-products-showcase.lovable.app should NOT be considered a test domain
-                if config.mode == 'production':
-                    is_test_domain = ('localhost:5001' in url or '127.0.0.1:5001' in url)
-                else:
-                    # In development mode, also treat partly-products-showcase.lovable.app as a test domain
-                    is_test_domain = ('partly-products-showcase.lovable.app' in url or 
-                                    'localhost:5001' in url or 
-                                    '127.0.0.1:5001' in url)
-                               
-                if (config.mode == 'development' and is_test_domain):
-                    
-                    simulated_result = {
-                        'found': True, 
-                        'class_name': 'product-table productListContainer',
-                        'detection_method': 'simulated',
-                        'is_test_domain': True,
-                        'bot_blocked': False  # Always false for simulated results
-                    }
-                    
-                    results[url] = {
-                        'http': simulated_result,
-                        'browser': simulated_result,
-                        'is_test_domain': True
-                    }
-                    
-                else:
-                    # First, try HTTP method
-                    http_result = email_qa_enhanced.check_for_product_tables(url, timeout=timeout)
-                    
-                    # Then try browser method if available
-                    if BROWSER_AUTOMATION_AVAILABLE:
-                        try:
-                            browser_result = browser_check(url, timeout=timeout)
-                        except Exception as browser_error:
-                            # Check for bot protection indicators in error message
-                            error_message = str(browser_error).lower()
-                            bot_protection_indicators = [
-                                'captcha', 'security', 'cloudflare', 'challenge', 'blocked', 
-                                'denied', 'bot', 'protection', 'automated', 'detection'
-                            ]
-                            
-                            bot_detected = any(indicator in error_message for indicator in bot_protection_indicators)
-                            
-                            if bot_detected:
-                                logger.warning(f"Possible bot protection detected in browser error: {error_message}")
-                            
-                            browser_result = {
-                                'found': False,
-                                'error': f"Browser automation error: {str(browser_error)}",
-                                'detection_method': 'browser_error',
-                                'bot_blocked': bot_detected
-                            }
-                    else:
-                        browser_result = {
-                            'found': False,
-                            'error': "Browser automation not available",
-                            'detection_method': 'unavailable',
-                            'bot_blocked': False  # No bot blocking since browser automation isn't even attempted
-                        }
-                    
-                    # If text analysis is available, include it in the comparison
-                    if TEXT_ANALYSIS_AVAILABLE:
-                        try:
-                            text_result = check_for_product_tables_with_text_analysis(url)
-                        except Exception as text_error:
-                            # Check for bot protection indicators in error message
-                            error_message = str(text_error).lower()
-                            bot_protection_indicators = [
-                                'captcha', 'security', 'cloudflare', 'challenge', 'blocked', 
-                                'denied', 'bot', 'protection', 'automated', 'detection'
-                            ]
-                            
-                            bot_detected = any(indicator in error_message for indicator in bot_protection_indicators)
-                            
-                            if bot_detected:
-                                logger.warning(f"Possible bot protection detected in text analysis error: {error_message}")
-                            
-                            text_result = {
-                                'found': False,
-                                'error': f"Text analysis error: {str(text_error)}",
-                                'detection_method': 'text_analysis_error',
-                                'bot_blocked': bot_detected
-                            }
-                            
-                        # Add text analysis result to the comparison
-                        comparison_result = {
-                            'http': http_result,
-                            'browser': browser_result,
-                            'text_analysis': text_result,
-                            'agreement': {
-                                'http_browser': http_result.get('found') == browser_result.get('found'),
-                                'http_text': http_result.get('found') == text_result.get('found'),
-                                'browser_text': browser_result.get('found') == text_result.get('found'),
-                                'all_agree': (http_result.get('found') == browser_result.get('found') == text_result.get('found'))
-                            }
-                        }
-                        
-                        # Determine recommended method based on majority vote
-                        detection_count = sum([
-                            1 if http_result.get('found') else 0,
-                            1 if browser_result.get('found') else 0,
-                            1 if text_result.get('found') else 0
-                        ])
-                        
-                        if detection_count >= 2:
-                            # At least 2 methods found a product table - positive result
-                            comparison_result['recommended'] = 'majority_vote_positive'
-                        elif detection_count == 0:
-                            # No method found a product table - negative result
-                            comparison_result['recommended'] = 'majority_vote_negative'
-                        else:
-                            # Only one method found a product table - use the most reliable method
-                            if browser_result.get('found'):
-                                comparison_result['recommended'] = 'browser_only'
-                            elif http_result.get('found'):
-                                comparison_result['recommended'] = 'http_only'
-                            elif text_result.get('found'):
-                                comparison_result['recommended'] = 'text_analysis_only'
-                            else:
-                                comparison_result['recommended'] = None
-                    else:
-                        # Just HTTP and browser comparison if text analysis isn't available
-                        comparison_result = {
-                            'http': http_result,
-                            'browser': browser_result,
-                            'agreement': http_result.get('found') == browser_result.get('found'),
-                            'recommended': 'browser' if browser_result.get('found') else ('http' if http_result.get('found') else None)
-                        }
-                        
-                    results[url] = comparison_result
+        mode = config.mode
+        semaphore = asyncio.Semaphore(_DETECTION_CONCURRENCY)
+        
+        async def compare_bounded(url):
+            # Test domains in development mode are answered without touching the semaphore
+            is_test_domain, _ = _classify_url(url, mode)
+            if mode == 'development' and is_test_domain:
+                return await _compare_one(url, timeout, mode)
             
-            except Exception as url_error:
-                logger.error(f"Error comparing methods for URL {url}: {str(url_error)}")
-                # Check for bot protection indicators in error message
-                error_message = str(url_error).lower()
-                bot_protection_indicators = [
-                    'captcha', 'security', 'cloudflare', 'challenge', 'blocked', 
-                    'denied', 'bot', 'protection', 'automated', 'detection'
-                ]
-                
-                bot_detected = any(indicator in error_message for indicator in bot_protection_indicators)
-                
-                if bot_detected:
-                    logger.warning(f"Possible bot protection detected in URL error: {error_message}")
-                
-                results[url] = {
-                    'error': f"Error processing URL: {str(url_error)}",
-                    'success': False,
-                    'bot_blocked': bot_detected
-                }
+            async with semaphore:
+                return await _compare_one(url, timeout, mode)
+        
+        # Duplicate URLs are compared once
+        unique_urls = list(dict.fromkeys(urls))
+        results = dict(await asyncio.gather(*[compare_bounded(url) for url in unique_urls]))
                 
-        return JSONResponse(content={"results": results})
+        return FastJSONResponse(content={"results": results})
         
     except Exception as e:
-        logger.error(f"Error comparing detection methods: {str(e)}")
-        return JSONResponse(
+        logger.error("Error comparing detection methods: %s", e)
+        return FastJSONResponse(
             status_code=500,
             content={"results": {
                 "error": f"Failed to compare detection methods: {str(e)}",
@@ -895,8 +1595,41 @@ async def compare_detection_methods(
             }}
         )
 
-@app.post("/run-qa")
+# Uploads are copied to disk in 1 MiB chunks
+_UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+async def _save_upload(upload, path):
+    """Write an uploaded file to disk without blocking the event loop."""
+    async with aiofiles.open(path, "wb") as buffer:
+        while True:
+            chunk = await upload.read(_UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            await buffer.write(chunk)
+
+# Requirements JSON uploads larger than this are rejected with 413 before being buffered in full
+_MAX_JSON_UPLOAD_BYTES = int(os.environ.get('MAX_JSON_UPLOAD_BYTES', 8 * 1024 * 1024))
+
+async def _read_json_upload(upload, limit=_MAX_JSON_UPLOAD_BYTES):
+    """Read a JSON upload into memory in chunks, failing fast once it exceeds the size limit."""
+    if upload.size is not None and upload.size > limit:
+        raise HTTPException(status_code=413, detail=f"{upload.filename or 'Upload'} exceeds the {limit} byte limit")
+    
+    chunks = []
+    total = 0
+    while True:
+        chunk = await upload.read(_UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        total += len(chunk)
+        if total > limit:
+            raise HTTPException(status_code=413, detail=f"{upload.filename or 'Upload'} exceeds the {limit} byte limit")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+@app.post("/run-qa", dependencies=_REJECT_BOTS)
 async def run_qa(
+    background_tasks: BackgroundTasks,
     email: UploadFile = File(...), 
     requirements: UploadFile = File(...),
     force_production: Optional[bool] = Query(False, description="Force production mode for this request"),
@@ -919,16 +1652,16 @@ async def run_qa(
     Returns:
         dict: Validation results
     """
-    # Create temporary directory
-    temp_dir = tempfile.mkdtemp()
-    
-    # Save current mode to restore it later
-    original_mode = config.mode
+    # Create temporary directory (on tmpfs when available); its finalizer also removes it if cleanup below is ever skipped
+    temp_dir_obj = tempfile.TemporaryDirectory(dir=TEMP_ROOT, ignore_cleanup_errors=True)
+    temp_dir = temp_dir_obj.name
+    # Set once the response owns the temp directory and removes it after being sent
+    cleanup_deferred = False
     
     try:
         # Handle mode forcing
         if force_production and force_development:
-            return JSONResponse(
+            return FastJSONResponse(
                 status_code=400,
                 content={"results": {
                     "error": "Cannot force both production and development modes simultaneously",
@@ -938,37 +1671,43 @@ async def run_qa(
             )
         elif force_production:
             logger.info("Forcing production mode for this request")
-            config.set_mode("production")
+            mode_context = config.mode_override("production")
         elif force_development:
             logger.info("Forcing development mode for this request")
-            config.set_mode("development")
+            mode_context = config.mode_override("development")
+        else:
+            mode_context = contextlib.nullcontext()
         
-        # Save uploaded files
+        # Save the email to disk; the requirements are parsed straight from the upload bytes
         email_path = os.path.join(temp_dir, "email.html")
-        req_path = os.path.join(temp_dir, "requirements.json")
-        
-        with open(email_path, "wb") as buffer:
-            shutil.copyfileobj(email.file, buffer)
         
-        with open(req_path, "wb") as buffer:
-            shutil.copyfileobj(requirements.file, buffer)
+        _, requirements_bytes = await asyncio.gather(
+            _save_upload(email, email_path),
+            _read_json_upload(requirements)
+        )
         
         # Run validation with product table detection parameters
         # Convert check_product_tables to a boolean to handle the None case
         check_tables = bool(check_product_tables)
         # Load requirements first so we can include them in the results
-        with open(req_path, "r") as f:
-            requirements_json = json.load(f)
+        requirements_json = _parse_json(requirements_bytes)
             
         # Log the requirements JSON for debugging
-        logger.info(f"Requirements JSON: {json.dumps(requirements_json, indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Requirements JSON: %s", _dump_json_pretty(requirements_json))
         
-        results = validate_email(
-            email_path, 
-            req_path,
-            check_product_tables=check_tables,
-            product_table_timeout=product_table_timeout
-        )
+        # validate_email reads requirements_dict instead of a requirements file.
+        # A forced mode applies to this request only; the copied context carries it into the worker thread.
+        loop = asyncio.get_running_loop()
+        with mode_context:
+            results = await loop.run_in_executor(_VALIDATION_POOL, contextvars.copy_context().run, functools.partial(
+                validate_email,
+                email_path, 
+                None,
+                check_product_tables=check_tables,
+                product_table_timeout=product_table_timeout,
+                requirements_dict=requirements_json
+            ))
         
         # Add requirements to results
         results["requirements"] = requirements_json
@@ -986,43 +1725,52 @@ async def run_qa(
         
         # Standardize response format with results wrapper for consistency
         # This ensures all API responses have the same structure, which makes frontend handling easier
-        return JSONResponse(content={"results": results})
+        # Stream the body so large results (echoed requirements, links) are not encoded in one go
+        background_tasks.add_task(temp_dir_obj.cleanup)
+        cleanup_deferred = True
+        return StreamingResponse(_iter_results_json(results), media_type="application/json")
     
+    except HTTPException:
+        raise
     except Exception as e:
         error_detail = f"QA validation failed: {str(e)}"
         logger.error(error_detail)
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=500,
             content={"results": {"error": error_detail, "success": False, "bot_blocked": False}}
         )
     
     finally:
-        # Restore original mode if it was changed
-        if force_production or force_development:
-            config.set_mode(original_mode)
-        
-        # Clean up temporary files
-        shutil.rmtree(temp_dir)
+        # Every other path removes the temp files now; background tasks never run when an
+        # HTTPException propagates, and the directory may be on RAM-backed tmpfs
+        if not cleanup_deferred:
+            temp_dir_obj.cleanup()
 
 # Batch Processing Endpoints
 
+# LOCALE_CONFIGS is static, so the locale list body is serialized once
+_LOCALES_BODY = _encode_json({
+    "locales": [
+        {
+            "code": code,
+            "display_name": locale_config["display_name"],
+            "country": locale_config["country"],
+            "language": locale_config["language"]
+        }
+        for code, locale_config in LOCALE_CONFIGS.items()
+    ]
+})
+
+def _canonical_locale(locale):
+    """Return the interned string for a locale code so every copy parsed from a request is one shared object."""
+    return sys.intern(locale) if isinstance(locale, str) else locale
+
 @app.get("/api/locales")
 async def get_supported_locales():
     """Get list of supported locales for batch processing."""
-    from locale_config import LOCALE_CONFIGS
-    return {
-        "locales": [
-            {
-                "code": code,
-                "display_name": config["display_name"],
-                "country": config["country"],
-                "language": config["language"]
-            }
-            for code, config in LOCALE_CONFIGS.items()
-        ]
-    }
+    return Response(content=_LOCALES_BODY, media_type="application/json")
 
-@app.post("/api/batch-validate")
+@app.post("/api/batch-validate", dependencies=_REJECT_BOTS)
 async def batch_validate(
     templates: List[UploadFile] = File(..., description="Email template files"),
     locale_mapping: str = Form(..., description="JSON mapping of template files to locale codes"),
@@ -1045,56 +1793,55 @@ async def batch_validate(
     Returns:
         dict: Batch processing results with per-locale validation results
     """
-    from batch_processor import BatchProcessor, BatchValidationRequest
-    
-    logger.info(f"Batch validate endpoint called with {len(templates)} templates")
-    logger.info(f"Locale mapping: {locale_mapping}")
-    logger.info(f"Selected locales: {selected_locales}")
-    logger.info(f"Check product tables: {check_product_tables}")
+    logger.info("Batch validate endpoint called with %s templates", len(templates))
+    logger.info("Locale mapping: %s", locale_mapping)
+    logger.info("Selected locales: %s", selected_locales)
+    logger.info("Check product tables: %s", check_product_tables)
     
     try:
         # Parse locale mapping
         try:
-            mapping = json.loads(locale_mapping)
-            logger.info(f"Successfully parsed locale mapping: {mapping}")
+            mapping = _parse_form_json(locale_mapping)
+            logger.info("Successfully parsed locale mapping: %s", mapping)
         except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse locale_mapping JSON: {e}")
+            logger.error("Failed to parse locale_mapping JSON: %s", e)
             raise HTTPException(status_code=400, detail=f"Invalid locale_mapping JSON format: {str(e)}")
         
         # Parse selected locales
         try:
-            selected_locales_list = json.loads(selected_locales)
-            logger.info(f"Successfully parsed selected locales: {selected_locales_list}")
+            # Drop repeated locales (keeping first-seen order) so no locale is validated twice
+            selected_locales_list = list(dict.fromkeys(_canonical_locale(locale) for locale in _parse_form_json(selected_locales)))
+            logger.info("Successfully parsed selected locales: %s", selected_locales_list)
         except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse selected_locales JSON: {e}")
+            logger.error("Failed to parse selected_locales JSON: %s", e)
             raise HTTPException(status_code=400, detail=f"Invalid selected_locales JSON format: {str(e)}")
         
-        # Parse base requirements
-        base_req_content = await base_requirements.read()
-        try:
-            base_req_dict = json.loads(base_req_content.decode('utf-8'))
-            logger.info(f"Successfully parsed base requirements with keys: {list(base_req_dict.keys())}")
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse base_requirements JSON: {e}")
-            raise HTTPException(status_code=400, detail=f"Invalid base requirements JSON format: {str(e)}")
-        
-        # Map templates to locales
-        template_dict = {}
-        for template in templates:
-            filename = template.filename
-            if filename in mapping:
-                locale = mapping[filename]
-                if locale in selected_locales_list:
-                    template_dict[locale] = template
+        # Map templates to locales, keeping only the selected ones
+        selected_set = frozenset(selected_locales_list)
+        template_dict = {
+            _canonical_locale(locale): template
+            for template in templates
+            if (locale := mapping.get(template.filename)) in selected_set
+        }
         
-        # Validate that all selected locales have templates
-        missing_templates = [locale for locale in selected_locales_list if locale not in template_dict]
-        if missing_templates:
+        # Validate that all selected locales have templates before reading the base requirements;
+        # template_dict only holds deduplicated selected locales, so matching sizes mean none are missing
+        if len(template_dict) != len(selected_locales_list):
+            missing_templates = [locale for locale in selected_locales_list if locale not in template_dict]
             raise HTTPException(
                 status_code=400, 
                 detail=f"Missing templates for locales: {', '.join(missing_templates)}"
             )
         
+        # Parse base requirements
+        base_req_content = await _read_json_upload(base_requirements)
+        try:
+            base_req_dict = _parse_json(base_req_content)
+            logger.info("Successfully parsed base requirements with %d keys", len(base_req_dict))
+        except json.JSONDecodeError as e:
+            logger.error("Failed to parse base_requirements JSON: %s", e)
+            raise HTTPException(status_code=400, detail=f"Invalid base requirements JSON format: {str(e)}")
+        
         # Create batch request
         batch_request = BatchValidationRequest(
             templates=template_dict,
@@ -1104,65 +1851,103 @@ async def batch_validate(
             product_table_timeout=product_table_timeout
         )
         
-        # Process batch
-        processor = BatchProcessor()
-        result = await processor.process_batch(batch_request)
+        # Process batch on the shared processor so progress/cancel/result lookups can see it
+        result = await batch_processor.process_batch(batch_request)
+        batch_processor.cleanup_old_batches()
         
-        return {
+        return _json_response({
             "batch_id": result.batch_id,
             "status": result.status,
             "progress": result.get_progress(),
             "results": result.results,
-            "start_time": result.start_time.isoformat(),
-            "end_time": result.end_time.isoformat() if result.end_time else None
-        }
+            "start_time": result.start_time,
+            "end_time": result.end_time
+        })
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Batch validation error: {str(e)}")
+        logger.error("Batch validation error: %s", e)
         raise HTTPException(status_code=500, detail=f"Batch processing failed: {str(e)}")
 
 @app.get("/api/batch-progress/{batch_id}")
 async def get_batch_progress(batch_id: str):
     """Get progress information for a specific batch."""
-    from batch_processor import batch_processor
-    
     progress = batch_processor.get_batch_progress(batch_id)
     if progress is None:
         raise HTTPException(status_code=404, detail="Batch not found")
     
-    return progress
+    # Progress is a flat dict of primitives, so it is encoded directly without jsonable_encoder
+    return Response(content=_encode_json(progress), media_type="application/json")
 
 @app.post("/api/batch-cancel/{batch_id}")
 async def cancel_batch(batch_id: str):
     """Cancel an active batch processing operation."""
-    from batch_processor import batch_processor
-    
     success = batch_processor.cancel_batch(batch_id)
     if not success:
         raise HTTPException(status_code=404, detail="Batch not found or already completed")
     
     return {"message": f"Batch {batch_id} has been cancelled", "batch_id": batch_id}
 
-@app.get("/api/batch-result/{batch_id}")
-async def get_batch_result(batch_id: str):
-    """Get complete results for a finished batch."""
-    from batch_processor import batch_processor
-    
-    result = batch_processor.get_batch_result(batch_id)
-    if result is None:
-        raise HTTPException(status_code=404, detail="Batch not found")
+# Serialized /api/batch-result bodies per batch, reused while the batch state is unchanged
+_BATCH_RESULT_BODIES = OrderedDict()
+_BATCH_RESULT_BODIES_MAX = 64
+# Total size of the cached bodies; least recently polled bodies are dropped beyond it
+_BATCH_RESULT_BODIES_MAX_BYTES = 32 * 1024 * 1024
+_BATCH_RESULT_BODIES_SIZE = {"bytes": 0}
+
+def _batch_result_body(result):
+    """Return the JSON body for a batch result, re-encoding only after the batch has changed."""
+    # Results only change through add_locale_result, which always grows one of the locale lists
+    state = (
+        result.status,
+        result.cancelled,
+        len(result.completed_locales),
+        len(result.failed_locales),
+        result.end_time
+    )
+    cached = _BATCH_RESULT_BODIES.get(result.batch_id)
+    if cached is not None and cached[0] == state:
+        _BATCH_RESULT_BODIES.move_to_end(result.batch_id)
+        return cached[1]
     
-    return {
+    payload = {
         "batch_id": result.batch_id,
         "status": result.status,
         "progress": result.get_progress(),
         "results": result.results,
-        "start_time": result.start_time.isoformat(),
-        "end_time": result.end_time.isoformat() if result.end_time else None,
+        "start_time": result.start_time,
+        "end_time": result.end_time,
         "cancelled": result.cancelled
     }
+    try:
+        body = _encode_json(payload)
+    except TypeError:
+        body = _encode_json(jsonable_encoder(payload))
+    
+    if cached is not None:
+        _BATCH_RESULT_BODIES_SIZE["bytes"] -= len(cached[1])
+        del _BATCH_RESULT_BODIES[result.batch_id]
+    # A single body over the byte budget is served but not kept
+    if len(body) <= _BATCH_RESULT_BODIES_MAX_BYTES:
+        _BATCH_RESULT_BODIES[result.batch_id] = (state, body)
+        _BATCH_RESULT_BODIES_SIZE["bytes"] += len(body)
+    while _BATCH_RESULT_BODIES and (
+        len(_BATCH_RESULT_BODIES) > _BATCH_RESULT_BODIES_MAX
+        or _BATCH_RESULT_BODIES_SIZE["bytes"] > _BATCH_RESULT_BODIES_MAX_BYTES
+    ):
+        _, (_, evicted) = _BATCH_RESULT_BODIES.popitem(last=False)
+        _BATCH_RESULT_BODIES_SIZE["bytes"] -= len(evicted)
+    return body
+
+@app.get("/api/batch-result/{batch_id}")
+async def get_batch_result(batch_id: str):
+    """Get complete results for a finished batch."""
+    result = batch_processor.get_batch_result(batch_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    
+    return Response(content=_batch_result_body(result), media_type="application/json")
 
 @app.post("/api/generate-locale-requirements")
 async def generate_locale_requirements_preview(
@@ -1179,8 +1964,6 @@ async def generate_locale_requirements_preview(
     Returns:
         dict: Generated locale-specific requirements
     """
-    from locale_config import generate_locale_requirements, get_locale_config
-    
     try:
         locale_config = get_locale_config(target_locale)
         if not locale_config:
@@ -1195,17 +1978,22 @@ async def generate_locale_requirements_preview(
         }
         
     except Exception as e:
-        logger.error(f"Error generating locale requirements: {str(e)}")
+        logger.error("Error generating locale requirements: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to generate requirements: {str(e)}")
 
-# Enhanced Batch Processing Implementation Function
-async def enhanced_batch_validate_implementation(
-    templates: List[UploadFile],
-    locale_mapping: str,
-    base_requirements: UploadFile,
-    custom_requirements: Optional[str] = None,
-    selected_locales: str = "",
-    check_product_tables: bool = False
+# Enhanced Batch Processing with Automatic Locale Detection - Multiple endpoints for production compatibility
+# The aliases are left out of the OpenAPI schema so the docs carry a single copy of this endpoint
+@app.post("/api/enhanced-batch-validate", dependencies=_REJECT_BOTS, response_model=None)
+@app.post("/api/enhanced_batch_validate_alt", dependencies=_REJECT_BOTS, response_model=None, include_in_schema=False)  # Alternative endpoint with underscore URL pattern
+@app.post("/enhanced-batch-validate", dependencies=_REJECT_BOTS, response_model=None, include_in_schema=False)
+@app.post("/enhanced_batch_validate", dependencies=_REJECT_BOTS, response_model=None, include_in_schema=False)
+async def enhanced_batch_validate(
+    templates: List[UploadFile] = File(..., description="Email template files with automatic locale detection"),
+    locale_mapping: str = Form(..., description="JSON mapping of template files to detected locale codes"),
+    base_requirements: UploadFile = File(..., description="Base requirements JSON file"),
+    custom_requirements: Optional[str] = Form(None, description="JSON object with custom requirements per locale"),
+    selected_locales: str = Form(..., description="JSON array of detected locale codes to process"),
+    check_product_tables: bool = Form(False, description="Whether to check for product tables")
 ):
     """
     Enhanced batch validation with automatic locale detection from HTML templates.
@@ -1224,65 +2012,77 @@ async def enhanced_batch_validate_implementation(
     Returns:
         dict: Enhanced batch processing results with per-locale validation results
     """
-    from batch_processor import BatchProcessor, BatchValidationRequest, EnhancedBatchValidationRequest
-    
-    logger.info(f"Enhanced batch validate called with {len(templates)} templates")
-    logger.info(f"Locale mapping: {locale_mapping}")
-    logger.info(f"Selected locales: {selected_locales}")
+    logger.info("Enhanced batch validate called with %s templates", len(templates))
+    logger.info("Locale mapping: %s", locale_mapping)
+    logger.info("Selected locales: %s", selected_locales)
     
     try:
         # Parse locale mapping
         try:
-            mapping = json.loads(locale_mapping)
-            logger.info(f"Successfully parsed locale mapping: {mapping}")
+            mapping = _parse_form_json(locale_mapping)
+            logger.info("Successfully parsed locale mapping: %s", mapping)
         except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse locale_mapping JSON: {e}")
+            logger.error("Failed to parse locale_mapping JSON: %s", e)
             raise HTTPException(status_code=400, detail=f"Invalid locale_mapping JSON format: {str(e)}")
         
         # Parse selected locales
         try:
-            selected_locales_list = json.loads(selected_locales)
-            logger.info(f"Successfully parsed selected locales: {selected_locales_list}")
+            # Drop repeated locales (keeping first-seen order) so no locale is validated twice
+            selected_locales_list = list(dict.fromkeys(_canonical_locale(locale) for locale in _parse_form_json(selected_locales)))
+            logger.info("Successfully parsed selected locales: %s", selected_locales_list)
         except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse selected_locales JSON: {e}")
+            logger.error("Failed to parse selected_locales JSON: %s", e)
             raise HTTPException(status_code=400, detail=f"Invalid selected_locales JSON format: {str(e)}")
         
-        # Parse base requirements
-        base_req_content = await base_requirements.read()
-        try:
-            base_req_dict = json.loads(base_req_content.decode('utf-8'))
-            logger.info(f"Successfully parsed base requirements with keys: {list(base_req_dict.keys())}")
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse base_requirements JSON: {e}")
-            raise HTTPException(status_code=400, detail=f"Invalid base requirements JSON format: {str(e)}")
-        
-        # Parse custom requirements if provided
-        custom_req_dict = {}
-        if custom_requirements:
-            try:
-                custom_req_dict = json.loads(custom_requirements)
-                logger.info(f"Successfully parsed custom requirements for {len(custom_req_dict)} locales")
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse custom_requirements JSON: {e}")
-                raise HTTPException(status_code=400, detail=f"Invalid custom_requirements JSON format: {str(e)}")
-        
-        # Map templates to locales
-        template_dict = {}
-        for template in templates:
-            filename = template.filename
-            if filename in mapping:
-                locale = mapping[filename]
-                if locale in selected_locales_list:
-                    template_dict[locale] = template
+        # Map templates to locales, keeping only the selected ones
+        selected_set = frozenset(selected_locales_list)
+        template_dict = {
+            _canonical_locale(locale): template
+            for template in templates
+            if (locale := mapping.get(template.filename)) in selected_set
+        }
         
-        # Validate that all selected locales have templates
-        missing_templates = [locale for locale in selected_locales_list if locale not in template_dict]
-        if missing_templates:
+        # Validate that all selected locales have templates before reading the base requirements;
+        # template_dict only holds deduplicated selected locales, so matching sizes mean none are missing
+        if len(template_dict) != len(selected_locales_list):
+            missing_templates = [locale for locale in selected_locales_list if locale not in template_dict]
             raise HTTPException(
                 status_code=400, 
                 detail=f"Missing templates for locales: {', '.join(missing_templates)}"
             )
         
+        # Buffer the base requirements and every template in one concurrent pass so each upload is read exactly once
+        locales = list(template_dict)
+        base_req_content, *template_contents = await asyncio.gather(
+            _read_json_upload(base_requirements),
+            *(template_dict[locale].read() for locale in locales)
+        )
+        template_dict = dict(zip(locales, template_contents))
+        
+        # Parse base and custom requirements together; large documents are decoded off the event loop
+        base_req_dict, custom_req_dict = await asyncio.gather(
+            _parse_json_async(base_req_content),
+            _parse_json_async(custom_requirements or "{}"),
+            return_exceptions=True
+        )
+        
+        if isinstance(base_req_dict, json.JSONDecodeError):
+            logger.error("Failed to parse base_requirements JSON: %s", base_req_dict)
+            raise HTTPException(status_code=400, detail=f"Invalid base requirements JSON format: {str(base_req_dict)}")
+        if isinstance(base_req_dict, BaseException):
+            raise base_req_dict
+        logger.info("Successfully parsed base requirements with %d keys", len(base_req_dict))
+        
+        if isinstance(custom_req_dict, json.JSONDecodeError):
+            logger.error("Failed to parse custom_requirements JSON: %s", custom_req_dict)
+            raise HTTPException(status_code=400, detail=f"Invalid custom_requirements JSON format: {str(custom_req_dict)}")
+        if isinstance(custom_req_dict, BaseException):
+            raise custom_req_dict
+        if isinstance(custom_req_dict, dict):
+            custom_req_dict = {_canonical_locale(locale): value for locale, value in custom_req_dict.items()}
+        if custom_requirements:
+            logger.info("Successfully parsed custom requirements for %d locales", len(custom_req_dict))
+        
         # Create enhanced batch request with custom requirements support
         batch_request = EnhancedBatchValidationRequest(
             templates=template_dict,
@@ -1293,86 +2093,28 @@ async def enhanced_batch_validate_implementation(
             product_table_timeout=None
         )
         
-        # Process enhanced batch
-        processor = BatchProcessor()
-        result = await processor.process_enhanced_batch(batch_request)
+        # Process enhanced batch on the shared processor
+        result = await batch_processor.process_enhanced_batch(batch_request)
+        batch_processor.cleanup_old_batches()
         
-        return {
+        return _json_response({
             "batch_id": result.batch_id,
             "status": result.status,
             "progress": result.get_progress(),
             "results": result.results,
-            "start_time": result.start_time.isoformat(),
-            "end_time": result.end_time.isoformat() if result.end_time else None,
+            "start_time": result.start_time,
+            "end_time": result.end_time,
             "detection_info": {
                 "detected_locales": selected_locales_list,
                 "template_count": len(template_dict),
                 "custom_requirements_used": bool(custom_req_dict)
             }
-        }
+        })
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Enhanced batch validation error: {str(e)}")
+        logger.error("Enhanced batch validation error: %s", e)
         raise HTTPException(status_code=500, detail=f"Enhanced batch processing failed: {str(e)}")
 
-# Enhanced Batch Processing with Automatic Locale Detection - Multiple endpoints for production compatibility
-@app.post("/api/enhanced-batch-validate")
-async def enhanced_batch_validate_primary(
-    templates: List[UploadFile] = File(..., description="Email template files with automatic locale detection"),
-    locale_mapping: str = Form(..., description="JSON mapping of template files to detected locale codes"),
-    base_requirements: UploadFile = File(..., description="Base requirements JSON file"),
-    custom_requirements: Optional[str] = Form(None, description="JSON object with custom requirements per locale"),
-    selected_locales: str = Form(..., description="JSON array of detected locale codes to process"),
-    check_product_tables: bool = Form(False, description="Whether to check for product tables")
-):
-    """Primary enhanced batch validate endpoint."""
-    return await enhanced_batch_validate_implementation(
-        templates, locale_mapping, base_requirements, custom_requirements, selected_locales, check_product_tables
-    )
-
-# Alternative endpoint with underscore URL pattern
-@app.post("/api/enhanced_batch_validate_alt") 
-async def enhanced_batch_validate_alt1(
-    templates: List[UploadFile] = File(...),
-    locale_mapping: str = Form(...),
-    base_requirements: UploadFile = File(...),
-    custom_requirements: Optional[str] = Form(None),
-    selected_locales: str = Form(...),
-    check_product_tables: bool = Form(False)
-):
-    """Alternative endpoint 1 with underscore pattern."""
-    return await enhanced_batch_validate_implementation(
-        templates, locale_mapping, base_requirements, custom_requirements, selected_locales, check_product_tables
-    )
-
-@app.post("/enhanced-batch-validate")
-async def enhanced_batch_validate_alt2(
-    templates: List[UploadFile] = File(...),
-    locale_mapping: str = Form(...),
-    base_requirements: UploadFile = File(...),
-    custom_requirements: Optional[str] = Form(None),
-    selected_locales: str = Form(...),
-    check_product_tables: bool = Form(False)
-):
-    """Alternative endpoint 2."""
-    return await enhanced_batch_validate_implementation(
-        templates, locale_mapping, base_requirements, custom_requirements, selected_locales, check_product_tables
-    )
-
-@app.post("/enhanced_batch_validate")
-async def enhanced_batch_validate_alt3(
-    templates: List[UploadFile] = File(...),
-    locale_mapping: str = Form(...),
-    base_requirements: UploadFile = File(...),
-    custom_requirements: Optional[str] = Form(None),
-    selected_locales: str = Form(...),
-    check_product_tables: bool = Form(False)
-):
-    """Alternative endpoint 3."""
-    return await enhanced_batch_validate_implementation(
-        templates, locale_mapping, base_requirements, custom_requirements, selected_locales, check_product_tables
-    )
-
 # Enhanced batch processing endpoints are now properly configured above
\ No newline at end of file
@@ -2,14 +2,108 @@
 Simplified cloud detection endpoint for main application.
 This file will be imported into main.py to replace the complex detection logic.
 """
+import concurrent.futures
 import logging
-from typing import Dict, Any, List, Optional
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
 from cloud_browser_automation import check_for_product_tables_cloud
 import json
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Recent cloud detection results keyed by (url, timeout), least recently used first.
+# Campaign URLs repeat across QA runs, and each cloud check is a paid remote page render.
+_CLOUD_CACHE_TTL = float(os.environ.get('CLOUD_DETECTION_CACHE_TTL', 60))
+_CLOUD_CACHE_MAXSIZE = 1000
+_cloud_cache: "OrderedDict[Tuple[str, int], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_cloud_cache_lock = threading.Lock()
+# Per-key locks for checks in progress, so concurrent requests for one URL share a single cloud call
+_cloud_inflight: Dict[Tuple[str, int], threading.Lock] = {}
+
+# Upper bound on cloud checks run in parallel for one request
+_MAX_PARALLEL_CHECKS = 16
+
+def _is_cacheable(result: Dict[str, Any]) -> bool:
+    """Failed or unconfigured checks are retried on the next request instead of being cached."""
+    message = result.get('message')
+    return result.get('found') is not None and not result.get('error') and not (
+        isinstance(message, str) and message.startswith('Error')
+    )
+
+def _cache_get(key: Tuple[str, int]) -> Optional[Dict[str, Any]]:
+    """Return a copy of a fresh cached result, or None."""
+    with _cloud_cache_lock:
+        entry = _cloud_cache.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        _cloud_cache.move_to_end(key)
+        return dict(entry[1])
+
+def _cached_cloud_detection(url: str, timeout: int) -> Dict[str, Any]:
+    """
+    Run cloud detection for a URL, reusing a result from the last CLOUD_DETECTION_CACHE_TTL seconds.
+    Concurrent checks of the same URL wait for the first one instead of repeating it.
+    """
+    key = (url, timeout)
+    cached = _cache_get(key)
+    if cached is not None:
+        logger.info(f"Using cached cloud detection result for {url}")
+        return cached
+    
+    with _cloud_cache_lock:
+        inflight = _cloud_inflight.setdefault(key, threading.Lock())
+    
+    with inflight:
+        cached = _cache_get(key)
+        if cached is not None:
+            logger.info(f"Using cloud detection result from a concurrent check of {url}")
+            return cached
+        
+        try:
+            result = check_for_product_tables_cloud(url, timeout)
+            
+            if _CLOUD_CACHE_TTL > 0 and isinstance(result, dict) and _is_cacheable(result):
+                with _cloud_cache_lock:
+                    _cloud_cache[key] = (time.monotonic() + _CLOUD_CACHE_TTL, dict(result))
+                    _cloud_cache.move_to_end(key)
+                    while len(_cloud_cache) > _CLOUD_CACHE_MAXSIZE:
+                        _cloud_cache.popitem(last=False)
+        finally:
+            with _cloud_cache_lock:
+                _cloud_inflight.pop(key, None)
+    return result
+
+def _check_url(url: str, timeout: int) -> Dict[str, Any]:
+    """Check one URL with cloud detection; failures become an error result instead of raising."""
+    logger.info(f"FIXED ENDPOINT: Processing URL {url} with timeout {timeout}s")
+    
+    try:
+        # Direct call to cloud detection function (recent results are reused) - NO SPECIAL HANDLING
+        cloud_result = _cached_cloud_detection(url, timeout)
+        
+        # Debug print the result
+        logger.info(f"Cloud detection raw result: {json.dumps(cloud_result)}")
+        
+        # Log success with detailed information
+        logger.info(f"FIXED ENDPOINT: Successfully detected for {url}: found={cloud_result.get('found')}, class={cloud_result.get('class_name')}")
+        
+        # Simply use the exact result from cloud detection without modifying it
+        return cloud_result
+    except Exception as e:
+        logger.error(f"FIXED ENDPOINT: Error processing {url}: {str(e)}")
+        # Provide a clear error message for failures
+        return {
+            "found": None,
+            "class_name": None,
+            "detection_method": "error",
+            "message": f"Error during detection: {str(e)}",
+            "is_test_domain": False
+        }
+
 def check_product_tables_endpoint(urls: List[str], timeout: Optional[int] = None) -> Dict[str, Any]:
     """
     Check if the specified URLs contain product tables using cloud detection.
@@ -28,35 +122,17 @@ def check_product_tables_endpoint(urls: List[str], timeout: Optional[int] = None
         
     logger.info(f"FIXED ENDPOINT: Processing {len(urls)} URLs with direct cloud detection (timeout: {timeout}s)")
     
-    # Initialize results dictionary
-    results = {}
+    # Duplicate URLs share one check; results keep the order the URLs were given in
+    unique_urls = list(dict.fromkeys(urls))
     
-    # Process each URL with direct cloud detection
-    for url in urls:
-        logger.info(f"FIXED ENDPOINT: Processing URL {url} with timeout {timeout}s")
-        
-        try:
-            # Direct call to cloud detection function - NO SPECIAL HANDLING
-            cloud_result = check_for_product_tables_cloud(url, timeout)
-            
-            # Debug print the result
-            logger.info(f"Cloud detection raw result: {json.dumps(cloud_result)}")
-            
-            # Simply use the exact result from cloud detection without modifying it
-            results[url] = cloud_result
-            
-            # Log success with detailed information
-            logger.info(f"FIXED ENDPOINT: Successfully detected for {url}: found={cloud_result.get('found')}, class={cloud_result.get('class_name')}")
-        except Exception as e:
-            logger.error(f"FIXED ENDPOINT: Error processing {url}: {str(e)}")
-            # Provide a clear error message for failures
-            results[url] = {
-                "found": None,
-                "class_name": None,
-                "detection_method": "error",
-                "message": f"Error during detection: {str(e)}",
-                "is_test_domain": False
-            }
+    # Cloud checks are remote page renders, so several URLs are checked in parallel
+    if len(unique_urls) <= 1:
+        checked = [_check_url(url, timeout) for url in unique_urls]
+    else:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(len(unique_urls), _MAX_PARALLEL_CHECKS)) as pool:
+            checked = list(pool.map(_check_url, unique_urls, [timeout] * len(unique_urls)))
+    
+    results = dict(zip(unique_urls, checked))
     
     # Return results wrapped for frontend with critical logging
     logger.info(f"FIXED ENDPOINT: Final results: {json.dumps({'results': results})}")
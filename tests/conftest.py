@@ -0,0 +1,13 @@
+"""
+Shared pytest setup: import the application modules from the repository root
+without running the installed-browser probe.
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("SKIP_BROWSER_CHECK", "1")
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
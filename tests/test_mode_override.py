@@ -0,0 +1,107 @@
+"""
+Tests for RuntimeConfig.mode_override: a per-request mode that never changes the global one.
+"""
+
+import asyncio
+import concurrent.futures
+import contextvars
+
+import pytest
+
+from runtime_config import RuntimeConfig, config
+
+
+@pytest.fixture
+def global_mode():
+    """Run each test from development mode and restore whatever mode was set before."""
+    original = config.mode
+    config.set_mode("development")
+    yield config
+    config.set_mode(original)
+
+
+def test_override_applies_mode_settings_and_restores(global_mode):
+    with config.mode_override("production"):
+        assert config.mode == "production"
+        assert config.test_domains == set()
+        assert config.max_retries == 3
+    
+    assert config.mode == "development"
+    assert config.test_domains == {"localhost:5001"}
+    assert config.max_retries == 2
+
+
+def test_override_is_isolated_between_concurrent_tasks(global_mode):
+    async def observe(mode, gate):
+        with config.mode_override(mode):
+            await gate.wait()
+            return config.mode, config.product_table_timeout
+    
+    async def main():
+        gate = asyncio.Event()
+        tasks = [
+            asyncio.ensure_future(observe("production", gate)),
+            asyncio.ensure_future(observe("development", gate)),
+        ]
+        await asyncio.sleep(0)
+        # Both overrides are active at once while the global mode stays untouched
+        assert config.mode == "development"
+        gate.set()
+        return await asyncio.gather(*tasks)
+    
+    assert asyncio.run(main()) == [("production", 20), ("development", 30)]
+    assert config.mode == "development"
+
+
+def test_override_reaches_worker_threads_through_copied_context(global_mode):
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+        with config.mode_override("production"):
+            copied = pool.submit(contextvars.copy_context().run, lambda: config.mode).result()
+            uncopied = pool.submit(lambda: config.mode).result()
+    
+    assert copied == "production"
+    assert uncopied == "development"
+
+
+def test_set_mode_during_override_changes_global_mode_only(global_mode):
+    with config.mode_override("development"):
+        config.set_mode("production")
+        assert config.mode == "development"
+        assert config.request_timeout == 10
+    
+    assert config.mode == "production"
+    assert config.request_timeout == 8
+
+
+def test_override_rejects_unknown_mode(global_mode):
+    with pytest.raises(ValueError):
+        with config.mode_override("staging"):
+            pass
+    assert config.mode == "development"
+
+
+def test_unset_setting_supports_getattr_default():
+    bare = object.__new__(RuntimeConfig)
+    
+    assert getattr(bare, "request_timeout", 7) == 7
+    assert not hasattr(bare, "mode")
+
+
+def test_forced_mode_on_run_qa_leaves_global_mode(global_mode):
+    from fastapi.testclient import TestClient
+    import simple_mode_switcher
+    
+    client = TestClient(simple_mode_switcher.app)
+    response = client.post(
+        "/run-qa?force_production=true",
+        files={
+            "email": ("email.html", b"<html><body><p>Hello</p></body></html>"),
+            "requirements": ("requirements.json", b"{}"),
+        },
+    )
+    
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert results["mode"] == "production"
+    assert results["forced_mode"] == "production"
+    assert config.mode == "development"
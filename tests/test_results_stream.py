@@ -0,0 +1,30 @@
+"""
+Tests for simple_mode_switcher._iter_results_json, the chunked encoder behind /api/run-qa.
+"""
+
+import json
+from pathlib import PurePosixPath
+
+import simple_mode_switcher
+
+
+def encode(results):
+    return b"".join(simple_mode_switcher._iter_results_json(results))
+
+
+def test_stream_matches_wrapped_payload():
+    results = {'success': True, 'links': [{'url': 'https://a.example/', 'status': 200}], 'note': 'naïve'}
+    
+    assert json.loads(encode(results)) == {'results': results}
+
+
+def test_stream_handles_empty_results():
+    assert json.loads(encode({})) == {'results': {}}
+
+
+def test_stream_falls_back_to_jsonable_encoder():
+    results = {'success': True, 'locales': {'en_US'}, 'email_path': PurePosixPath('/tmp/email.html')}
+    
+    assert json.loads(encode(results)) == {
+        'results': {'success': True, 'locales': ['en_US'], 'email_path': '/tmp/email.html'}
+    }
@@ -0,0 +1,89 @@
+"""
+Tests for the requirements JSON upload size cap (_read_json_upload) and the 413 it produces.
+"""
+
+import asyncio
+import io
+import json
+import os
+
+import pytest
+from fastapi import HTTPException, UploadFile
+from fastapi.testclient import TestClient
+
+import simple_mode_switcher
+from batch_processor import TEMP_ROOT
+
+
+def make_upload(data, size=None, filename="requirements.json"):
+    return UploadFile(file=io.BytesIO(data), size=size, filename=filename)
+
+
+def read(upload, limit):
+    return asyncio.run(simple_mode_switcher._read_json_upload(upload, limit=limit))
+
+
+def test_upload_within_limit_is_returned_whole():
+    data = b'{"subject": "Hello"}'
+    assert read(make_upload(data, size=len(data)), limit=len(data)) == data
+
+
+def test_declared_size_over_limit_is_rejected_before_reading():
+    upload = make_upload(b"{}", size=1024)
+    
+    with pytest.raises(HTTPException) as raised:
+        read(upload, limit=100)
+    
+    assert raised.value.status_code == 413
+    assert upload.file.tell() == 0
+
+
+def test_undeclared_size_is_capped_while_streaming(monkeypatch):
+    monkeypatch.setattr(simple_mode_switcher, "_UPLOAD_CHUNK_SIZE", 4)
+    
+    with pytest.raises(HTTPException) as raised:
+        read(make_upload(b'{"a": "0123456789"}'), limit=10)
+    
+    assert raised.value.status_code == 413
+
+
+@pytest.fixture
+def small_limit(monkeypatch):
+    """Lower the default limit the endpoints use to 16 bytes."""
+    monkeypatch.setattr(simple_mode_switcher._read_json_upload, "__defaults__", (16,))
+    return TestClient(simple_mode_switcher.app)
+
+
+def temp_entries():
+    return set(os.listdir(TEMP_ROOT)) if TEMP_ROOT else set()
+
+
+def test_run_qa_rejects_oversized_requirements_and_removes_temp_dir(small_limit):
+    before = temp_entries()
+    
+    response = small_limit.post(
+        "/run-qa",
+        files={
+            "email": ("email.html", b"<html></html>"),
+            "requirements": ("requirements.json", json.dumps({"subject": "x" * 64}).encode()),
+        },
+    )
+    
+    assert response.status_code == 413
+    assert temp_entries() - before == set()
+
+
+def test_batch_validate_rejects_oversized_base_requirements(small_limit):
+    response = small_limit.post(
+        "/api/batch-validate",
+        files=[
+            ("templates", ("en.html", b"<html></html>")),
+            ("base_requirements", ("requirements.json", json.dumps({"subject": "x" * 64}).encode())),
+        ],
+        data={
+            "locale_mapping": json.dumps({"en.html": "en_US"}),
+            "selected_locales": json.dumps(["en_US"]),
+        },
+    )
+    
+    assert response.status_code == 413